@@ -0,0 +1,203 @@
+"""Compare payload size and interaction latency of server-side and clientside chart filtering.
+
+The server path posts every main page category and details page (year, team)
+interaction to the Dash test client and records response size and latency,
+once with the figure cache cleared and once warm. The clientside path runs
+dashboard/assets/clientside.js under Node.js on the match-data store and
+records its latency; it sends nothing per interaction, only the store once
+with the layout. Clientside figures are checked against the server responses.
+
+Run from the repository root (needs `node` on the PATH):
+
+    python benchmarks/clientside.py --repeat 5
+"""
+import argparse
+import gzip
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# The dashboard modules use paths relative to the dashboard directory
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+os.chdir(DASHBOARD_DIR)
+
+# The server path is the default mode; the clientside pieces are used directly
+os.environ.pop("CLIENTSIDE_FILTERING", None)
+
+import plotly  # noqa: E402
+
+import app as dashboard  # noqa: E402
+from client_data import match_data_store  # noqa: E402
+from details_page import aggregate_store  # noqa: E402
+from figure_cache import figure_cache  # noqa: E402
+
+CATEGORIES = ["League-Match", "Semi-Final", "Final"]
+DETAILS_OUTPUTS = [
+    "winning-team.children", "total-matches.children", "played-matches.children", "abandoned.children",
+    "match-type-summary-chart.figure", "team-performance-chart.figure", "runs-vs-wickets-chart.figure",
+    "venue-performance-chart.figure", "team-dropdown.options",
+]
+CHART_OUTPUTS = ["summary-chart-1.figure", "summary-chart-2.figure"]
+
+# Runs clientside.js with a stub window and times every interaction
+NODE_RUNNER = """
+const fs = require("fs");
+const [scriptPath, inputPath, repeat] = process.argv.slice(2);
+global.window = {};
+eval(fs.readFileSync(scriptPath, "utf8"));
+const {store, interactions} = JSON.parse(fs.readFileSync(inputPath, "utf8"));
+const functions = window.dash_clientside.worldcup;
+const results = interactions.map(({name, args, triggered}) => {
+    window.dash_clientside.callback_context = {triggered: [{prop_id: triggered, value: 1}]};
+    const samples = [];
+    let output;
+    for (let i = 0; i < Number(repeat); i++) {
+        const start = process.hrtime.bigint();
+        output = functions[name](...args, store);
+        samples.push(Number(process.hrtime.bigint() - start) / 1e6);
+    }
+    samples.sort((a, b) => a - b);
+    return {median_ms: samples[Math.floor(samples.length / 2)], output};
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+def interactions():
+    """Every chart interaction: each category button, and each year alone and with each of its teams."""
+    for category in CATEGORIES:
+        yield {"name": "update_charts", "args": [1, 1, 1], "triggered": f"{category}.n_clicks"}
+    for year in aggregate_store.years():
+        for team in [None] + list(aggregate_store.year(year)["teams"]):
+            yield {"name": "update_details_page", "args": [int(year), team], "triggered": "team-dropdown.value"}
+
+
+def server_request(interaction):
+    if interaction["name"] == "update_charts":
+        outputs = CHART_OUTPUTS
+        inputs = [{"id": category, "property": "n_clicks", "value": 1} for category in CATEGORIES]
+    else:
+        outputs = DETAILS_OUTPUTS
+        year, team = interaction["args"]
+        inputs = [
+            {"id": "year-dropdown", "property": "value", "value": year},
+            {"id": "team-dropdown", "property": "value", "value": team},
+        ]
+    return {
+        "output": ".." + "...".join(outputs) + "..",
+        "outputs": [{"id": output.split(".")[0], "property": output.split(".")[1]} for output in outputs],
+        "inputs": inputs,
+        "changedPropIds": [interaction["triggered"]],
+        "state": [],
+    }
+
+
+def run_server(cases, repeat, cold):
+    """Response bytes and median latency of each interaction through the Dash server."""
+    client = dashboard.app.server.test_client()
+    results = []
+    for interaction in cases:
+        body = server_request(interaction)
+        samples = []
+        for _ in range(repeat):
+            if cold:
+                figure_cache.clear()
+            start = time.perf_counter()
+            response = client.post("/_dash-update-component", json=body)
+            samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        payload = response.get_data()
+        samples.sort()
+        results.append({
+            "median_ms": samples[len(samples) // 2],
+            "bytes": len(payload),
+            "gzip_bytes": len(gzip.compress(payload)),
+            "response": json.loads(payload)["response"],
+        })
+    return results
+
+
+def run_client(store, cases, repeat):
+    """Median latency and outputs of each interaction in clientside.js under Node.js."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.json")
+        with open(input_path, "w") as f:
+            json.dump({"store": store, "interactions": cases}, f, cls=plotly.utils.PlotlyJSONEncoder)
+        runner = os.path.join(tmp, "runner.js")
+        with open(runner, "w") as f:
+            f.write(NODE_RUNNER)
+        script = os.path.join(DASHBOARD_DIR, "assets", "clientside.js")
+        completed = subprocess.run(
+            ["node", runner, script, input_path, str(repeat)], capture_output=True, text=True, check=True
+        )
+    return json.loads(completed.stdout)
+
+
+def same(expected, actual, path="output"):
+    """Assert two decoded JSON values match, comparing numbers with a tolerance."""
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        assert math.isclose(expected, actual, rel_tol=1e-6, abs_tol=1e-6), f"{path}: {expected} != {actual}"
+    elif isinstance(expected, dict) and isinstance(actual, dict):
+        assert expected.keys() == actual.keys(), f"{path}: keys {sorted(expected)} != {sorted(actual)}"
+        for key in expected:
+            same(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, list) and isinstance(actual, list):
+        assert len(expected) == len(actual), f"{path}: length {len(expected)} != {len(actual)}"
+        for i, (left, right) in enumerate(zip(expected, actual)):
+            same(left, right, f"{path}[{i}]")
+    else:
+        assert expected == actual, f"{path}: {expected!r} != {actual!r}"
+
+
+def check_equivalence(cases, server, client):
+    for interaction, served, computed in zip(cases, server, client):
+        outputs = CHART_OUTPUTS if interaction["name"] == "update_charts" else DETAILS_OUTPUTS
+        for output, value in zip(outputs, computed["output"]):
+            component, prop = output.split(".")
+            same(served["response"][component][prop], value, f"{interaction['name']}{interaction['args']} {output}")
+
+
+def summarize(label, results):
+    latency = sorted(result["median_ms"] for result in results)
+    return (
+        f"{label:<22} {sum(r.get('bytes', 0) for r in results) / len(results):>9.0f} B/interaction "
+        f"({sum(r.get('gzip_bytes', 0) for r in results) / len(results):>7.0f} B gzip), "
+        f"latency median {latency[len(latency) // 2]:.2f} ms, max {latency[-1]:.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per interaction")
+    args = parser.parse_args()
+
+    store = match_data_store().data
+    store_bytes = json.dumps(store, cls=plotly.utils.PlotlyJSONEncoder).encode()
+    cases = list(interactions())
+
+    cold = run_server(cases, args.repeat, cold=True)
+    warm = run_server(cases, args.repeat, cold=False)
+    client = run_client(store, cases, args.repeat)
+    check_equivalence(cases, warm, client)
+    print(f"equivalence: {len(cases)} interactions produce the same outputs clientside and on the server")
+
+    script = os.path.getsize(os.path.join(DASHBOARD_DIR, "assets", "clientside.js"))
+    print(f"interactions: {len(cases)} ({len(CATEGORIES)} category clicks, {len(cases) - len(CATEGORIES)} year/team picks)")
+    print(summarize("server, cache cleared", cold))
+    print(summarize("server, cache warm", warm))
+    print(summarize("clientside (node)", client))
+    print(
+        f"clientside one-off cost: store {len(store_bytes)} B ({len(gzip.compress(store_bytes))} B gzip) "
+        f"with the layout, clientside.js {script} B"
+    )
+    total = sum(result["bytes"] for result in warm)
+    print(f"server bytes for one pass over every interaction: {total} B, {total / len(store_bytes):.1f}x the store")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compare accuracy and latency of the CPU inference backends on scored commentary.
+
+Sentiment labels are checked against the reference labels stored in
+data/commentary_with_sentiment.csv. NER output is checked against the plain
+pipeline backend, since the file holds no reference entities.
+
+Run from the repository root:
+
+    python benchmarks/compare_backends.py --backends pipeline quantized onnx --limit 200
+"""
+import argparse
+import ast
+import os
+import sys
+import time
+
+import pandas as pd
+
+# The dashboard modules use paths relative to the dashboard directory
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+os.chdir(DASHBOARD_DIR)
+
+from model_registry import ModelRegistry, format_stats  # noqa: E402
+
+REFERENCE_PATH = "../data/commentary_with_sentiment.csv"
+
+
+def load_reference(limit=None):
+    """Commentary texts and their reference sentiment labels."""
+    data = pd.read_csv(REFERENCE_PATH, index_col=0)
+    if limit:
+        data = data.head(limit)
+    labels = [ast.literal_eval(value)[0]["label"] for value in data["sentiment"]]
+    return data["commentary"].astype(str).tolist(), labels
+
+
+def run_backend(backend, texts, batch_size, max_length):
+    registry = ModelRegistry(backend=backend)
+    registry.warm_up()
+    sentiment_model = registry.get("sentiment")
+    ner_model = registry.get("ner")
+
+    start = time.perf_counter()
+    outputs = sentiment_model(texts, batch_size=batch_size, truncation=True, max_length=max_length)
+    sentiment_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    entities = ner_model(texts, batch_size=batch_size)
+    ner_seconds = time.perf_counter() - start
+
+    return {
+        "labels": [output["label"] for output in outputs],
+        "entities": [{(e["word"], e["entity"]) for e in found} for found in entities],
+        "sentiment_ms": sentiment_seconds * 1000 / len(texts),
+        "ner_ms": ner_seconds * 1000 / len(texts),
+        "stats": registry.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["pipeline", "quantized", "onnx"])
+    parser.add_argument("--limit", type=int, default=None, help="only use the first N commentary lines")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-length", type=int, default=512)
+    args = parser.parse_args()
+
+    texts, reference = load_reference(args.limit)
+    print(f"{len(texts)} commentary lines")
+
+    results = {}
+    for backend in args.backends:
+        try:
+            results[backend] = run_backend(backend, texts, args.batch_size, args.max_length)
+        except ImportError as exc:
+            print(f"{backend}: skipped ({exc})")
+
+    baseline_entities = results["pipeline"]["entities"] if "pipeline" in results else None
+    for backend, result in results.items():
+        agreement = sum(a == b for a, b in zip(result["labels"], reference)) / len(reference)
+        line = (
+            f"{backend}: sentiment {result['sentiment_ms']:.1f} ms/line, label agreement {agreement:.1%}; "
+            f"ner {result['ner_ms']:.1f} ms/line"
+        )
+        if baseline_entities is not None and backend != "pipeline":
+            same = sum(a == b for a, b in zip(result["entities"], baseline_entities)) / len(texts)
+            line += f", entities identical to pipeline on {same:.1%} of lines"
+        print(line)
+        print("  " + format_stats(result["stats"]).replace("\n", "\n  "))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Compare details page callback latency: per-request filtering vs the precomputed aggregate store.
+
+Before timing, the vectorized team-view helpers are checked against the
+original row-by-row implementations kept below as references.
+
+Run from the repository root:
+
+    python benchmarks/details_callback.py --scale 100
+
+The equivalence checks also run as tests, for CI:
+
+    python -m pytest benchmarks/details_callback.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+from plotly.utils import PlotlyJSONEncoder
+
+# The dashboard modules use paths relative to the dashboard directory
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+os.chdir(DASHBOARD_DIR)
+
+import details_page  # noqa: E402
+from aggregates import AggregateStore, team_match_stats, team_totals, team_view, venue_totals  # noqa: E402
+
+
+def scale_dataset(data, scale):
+    """Repeat the match table `scale` times so every year holds `scale` times more matches."""
+    return pd.concat([data] * scale, ignore_index=True)
+
+
+# Reference implementations from before the team view, used for equivalence checks and timing
+def legacy_team_totals(filtered_data):
+    team_runs = pd.concat([
+        filtered_data[["team_1", "team_1_runs"]].rename(columns={"team_1": "team", "team_1_runs": "runs"}),
+        filtered_data[["team_2", "team_2_runs"]].rename(columns={"team_2": "team", "team_2_runs": "runs"}),
+    ])
+    team_wickets = pd.concat([
+        filtered_data[["team_1", "team_1_wickets"]].rename(columns={"team_1": "team", "team_1_wickets": "wickets"}),
+        filtered_data[["team_2", "team_2_wickets"]].rename(columns={"team_2": "team", "team_2_wickets": "wickets"}),
+    ])
+    total_runs = team_runs.groupby("team")["runs"].sum().reset_index()
+    total_wickets = team_wickets.groupby("team")["wickets"].sum().reset_index()
+    return pd.merge(total_runs, total_wickets, on="team")
+
+
+def legacy_team_match_stats(filtered_data, selected_team):
+    team_data = filtered_data[(filtered_data["team_1"] == selected_team) | (filtered_data["team_2"] == selected_team)]
+    runs_list = []
+    wickets_list = []
+    for _, row in team_data.iterrows():
+        if row["team_1"] == selected_team:
+            runs_list.append(row["team_1_runs"])
+            wickets_list.append(row["team_1_wickets"])
+        elif row["team_2"] == selected_team:
+            runs_list.append(row["team_2_runs"])
+            wickets_list.append(row["team_2_wickets"])
+    return pd.DataFrame({"runs": runs_list, "wickets": wickets_list})
+
+
+def legacy_venue_totals(filtered_data, selected_team):
+    team_data = filtered_data[(filtered_data["team_1"] == selected_team) | (filtered_data["team_2"] == selected_team)]
+    venue_list = []
+    runs_list = []
+    wickets_list = []
+    for venue in team_data["venue"].unique():
+        venue_data = team_data[team_data["venue"] == venue]
+        runs = 0
+        wickets = 0
+        for _, row in venue_data.iterrows():
+            if row["team_1"] == selected_team:
+                runs += row["team_1_runs"]
+                wickets += row["team_2_wickets"]
+            elif row["team_2"] == selected_team:
+                runs += row["team_2_runs"]
+                wickets += row["team_1_wickets"]
+        venue_list.append(venue)
+        runs_list.append(runs)
+        wickets_list.append(wickets)
+    return pd.DataFrame({"Venue": venue_list, "Runs": runs_list, "Wickets": wickets_list})
+
+
+def check_equivalence(data):
+    """Assert the team-view helpers and the store match the reference implementations."""
+    store = AggregateStore(data)
+    checked = 0
+    for year in sorted(data["world_cup_year"].unique()):
+        filtered_data = data[data["world_cup_year"] == year]
+        view = team_view(filtered_data)
+        pd.testing.assert_frame_equal(team_totals(view), legacy_team_totals(filtered_data), check_dtype=False)
+        pd.testing.assert_frame_equal(store.year(year)["team_totals"], legacy_team_totals(filtered_data), check_dtype=False)
+
+        for team in pd.concat([filtered_data["team_1"], filtered_data["team_2"]]).unique():
+            expected_matches = legacy_team_match_stats(filtered_data, team)
+            expected_venues = legacy_venue_totals(filtered_data, team)
+            pd.testing.assert_frame_equal(team_match_stats(view, team), expected_matches, check_dtype=False)
+            pd.testing.assert_frame_equal(venue_totals(view, team), expected_venues, check_dtype=False)
+            pd.testing.assert_frame_equal(store.team(year, team)["matches"], expected_matches, check_dtype=False)
+            pd.testing.assert_frame_equal(store.team(year, team)["venues"], expected_venues, check_dtype=False)
+            checked += 1
+    return checked
+
+
+def filtered_callback(data, selected_year, selected_team):
+    """The details callback as it worked before precomputation and the team view."""
+    filtered_data = data[data["world_cup_year"] == selected_year]
+    winning_team = filtered_data[filtered_data["match_category"] == "Final"]["winning_team"].values[0]
+    played = filtered_data[filtered_data["match_status"] == "played"].shape[0]
+    abandoned = filtered_data[filtered_data["match_status"] == "abandoned"].shape[0]
+    teams = pd.concat([filtered_data["team_1"], filtered_data["team_2"]]).unique()
+    team = selected_team if selected_team else winning_team
+    return (
+        winning_team,
+        filtered_data.shape[0],
+        played,
+        abandoned,
+        details_page.create_world_cup_match_type_summary_chart(filtered_data),
+        details_page.plot_team_performance(legacy_team_totals(filtered_data)),
+        details_page.plot_runs_vs_wickets(legacy_team_match_stats(filtered_data, team), team),
+        details_page.plot_venue_performance(legacy_venue_totals(filtered_data, team), team),
+        teams,
+    )
+
+
+def store_callback(store, selected_year, selected_team):
+    """The details callback served from the aggregate store."""
+    year_stats = store.year(selected_year)
+    team = selected_team if selected_team else year_stats["winner"]
+    team_stats = store.team(selected_year, team)
+    return (
+        year_stats["winner"],
+        year_stats["total_matches"],
+        year_stats["played_matches"],
+        year_stats["abandoned_matches"],
+        details_page.plot_match_type_summary(year_stats["category_counts"]),
+        details_page.plot_team_performance(year_stats["team_totals"]),
+        details_page.plot_runs_vs_wickets(team_stats["matches"], team),
+        details_page.plot_venue_performance(team_stats["venues"], team),
+        year_stats["teams"],
+    )
+
+
+def _comparable(value):
+    if hasattr(value, "to_plotly_json"):
+        return json.loads(json.dumps(value, cls=PlotlyJSONEncoder))
+    return list(value) if isinstance(value, (list, pd.api.extensions.ExtensionArray)) or hasattr(value, "tolist") else value
+
+
+def callback_differences(data):
+    """(year, team, output position) of every output where the store callback differs from the filtered one."""
+    store = AggregateStore(data)
+    differences = []
+    for year in store.years():
+        for team in [None] + store.year(year)["teams"]:
+            expected = filtered_callback(data, year, team)
+            actual = store_callback(store, year, team)
+            for position, (a, b) in enumerate(zip(expected, actual)):
+                if _comparable(a) != _comparable(b):
+                    differences.append((year, team, position))
+    return differences
+
+
+def test_store_matches_references():
+    assert check_equivalence(details_page.get_matches()) > 0
+
+
+def test_store_callback_matches_filtered_callback():
+    differences = callback_differences(details_page.get_matches())
+    assert not differences, f"{len(differences)} outputs differ, first: {differences[:5]}"
+
+
+def time_calls(func, target, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for year, team in inputs:
+            func(target, year, team)
+    return (time.perf_counter() - start) / (repeat * len(inputs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100, help="how many copies of the dataset to stack")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over every (year, team) input")
+    args = parser.parse_args()
+
+    checked = check_equivalence(details_page.get_matches())
+    print(f"equivalence: {checked} (year, team) pairs match the reference implementations")
+
+    data = scale_dataset(details_page.get_matches(), args.scale)
+
+    start = time.perf_counter()
+    store = AggregateStore(data)
+    build_seconds = time.perf_counter() - start
+
+    # One call per year with no team picked, and one for the first team of each year
+    inputs = []
+    for year in store.years():
+        inputs.append((year, None))
+        inputs.append((year, store.year(year)["teams"][0]))
+
+    filtered = time_calls(filtered_callback, data, inputs, args.repeat)
+    cached = time_calls(store_callback, store, inputs, args.repeat)
+
+    print(f"rows: {len(data)} ({args.scale}x), callback inputs: {len(inputs)}")
+    print(f"aggregate store build: {build_seconds * 1000:.1f} ms (once per data change)")
+    print(f"filtered callback:     {filtered * 1000:.2f} ms/call")
+    print(f"store callback:        {cached * 1000:.2f} ms/call")
+    print(f"speedup:               {filtered / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
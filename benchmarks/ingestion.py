@@ -0,0 +1,75 @@
+"""Measure ingestion throughput of the ETL pipeline for different worker counts.
+
+Builds a synthetic archive of year files by resampling the real WorldCup_Stats
+rows, then runs a full (forced) rebuild with each worker count.
+
+Run from the repository root:
+
+    python benchmarks/ingestion.py --files 200 --rows 500 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# The dashboard modules use paths relative to the dashboard directory
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+os.chdir(DASHBOARD_DIR)
+
+import etl  # noqa: E402
+
+
+def build_archive(directory, files, rows, seed=0):
+    """Write `files` synthetic year files of `rows` matches each into `directory`."""
+    source = pd.concat([pd.read_csv(path) for path in etl.year_files()], ignore_index=True)
+    for i in range(files):
+        year = 3000 + i
+        sample = source.sample(n=rows, replace=True, random_state=seed + i).reset_index(drop=True)
+        sample["world_cup_year"] = year
+        sample.to_csv(os.path.join(directory, f"{year}_Match_Stats.csv"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=500, help="matches per synthetic year file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = os.path.join(tmp, "input")
+        os.makedirs(input_dir)
+        build_archive(input_dir, args.files, args.rows)
+        print(f"archive: {args.files} files x {args.rows} rows")
+
+        outputs = []
+        for workers in args.workers:
+            output = os.path.join(tmp, f"cleaned_{workers}.csv")
+            start = time.perf_counter()
+            summary = etl.run(input_dir, output, os.path.join(tmp, f"state_{workers}"), force=True, workers=workers)
+            seconds = time.perf_counter() - start
+
+            parse_seconds = sorted(summary["timings"].values())
+            print(
+                f"workers={workers}: {seconds:.2f} s, "
+                f"{len(summary['processed']) / seconds:.1f} files/s, {summary['raw_rows'] / seconds:.0f} rows/s "
+                f"(per file: median {parse_seconds[len(parse_seconds) // 2] * 1000:.1f} ms, "
+                f"max {parse_seconds[-1] * 1000:.1f} ms)"
+            )
+            outputs.append(output)
+
+        # Parallel runs must produce exactly the serial output
+        with open(outputs[0], "rb") as f:
+            reference = f.read()
+        for output in outputs[1:]:
+            with open(output, "rb") as f:
+                assert f.read() == reference, f"{output} differs from {outputs[0]}"
+        print("outputs identical across worker counts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Time live match appends against tables of growing size and check them against full rebuilds.
+
+For each scale the per-year aggregates, the head-to-head index and the player
+leaderboards are built over a synthetic table (see suite.py), then match
+records are appended one at a time through LiveIngest: validation, the CSV
+append, the write into the table's column buffers (which also builds the frame
+get_matches returns next) and every listener. The latency should stay flat
+as the table grows; only the year a match belongs to is recomputed, so it
+follows the size of that year rather than the table. Afterwards the table and
+the incrementally updated structures are compared with ones rebuilt from the
+whole table.
+
+The CSV append goes to a temporary file, never to data/crick_df_cleaned.csv.
+
+Run from the repository root:
+
+    python benchmarks/live_append.py --scales 1 10 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from suite import DASHBOARD_DIR, synthetic_matches
+
+sys.path.insert(0, DASHBOARD_DIR)
+
+from aggregates import AggregateStore  # noqa: E402
+from dataset import MatchTable, concat_matches, get_matches  # noqa: E402
+from head_to_head import HeadToHeadIndex  # noqa: E402
+from live import MATCH_COLUMNS, LiveIngest  # noqa: E402
+from players import PlayerLeaderboards  # noqa: E402
+
+
+def table_appender(path, table):
+    """Append rows to a CSV and a MatchTable like dataset.append_matches does, for a table that is not the shared one."""
+
+    def append_rows(rows):
+        rows = rows.set_axis(pd.RangeIndex(len(table), len(table) + len(rows)))
+        rows.to_csv(path, mode="a", header=False)
+        return table.append(rows.reset_index(names="Unnamed: 0"))
+
+    return append_rows
+
+
+def records(data, count, seed=0):
+    """Match records for existing years, between real teams so they pass validation."""
+    rng = np.random.default_rng(seed)
+    base = get_matches()
+    teams = sorted(pd.concat([base["team_1"], base["team_2"]]).astype(str).unique())
+    # Synthetic tables run past the latest year the validator accepts
+    years = [year for year in data["world_cup_year"].unique() if year <= 2100]
+    for i in range(count):
+        team_1, team_2 = rng.choice(teams, 2, replace=False)
+        yield {
+            "venue": f"Venue {i % 7}",
+            "host_country": "ENG",
+            "match_category": "League-Match",
+            "match_status": "played",
+            "team_1": team_1,
+            "team_2": team_2,
+            "world_cup_year": int(rng.choice(years)),
+            "team_1_runs": int(rng.integers(100, 400)),
+            "team_1_wickets": int(rng.integers(0, 11)),
+            "team_2_runs": int(rng.integers(100, 400)),
+            "team_2_wickets": int(rng.integers(0, 11)),
+            "winning_team": team_1 if i % 2 else team_2,
+        }
+
+
+def same(expected, actual, path):
+    """Assert nested store state matches, ignoring unused categories and row labels."""
+    if isinstance(expected, dict):
+        assert expected.keys() == actual.keys(), f"{path}: keys differ"
+        for key in expected:
+            same(expected[key], actual[key], f"{path}[{key!r}]")
+    elif isinstance(expected, pd.DataFrame):
+        pdt.assert_frame_equal(
+            expected.reset_index(drop=True), actual.reset_index(drop=True),
+            check_categorical=False, check_dtype=False, obj=path,
+        )
+    elif isinstance(expected, np.ndarray):
+        assert np.array_equal(np.sort(expected), np.sort(actual)), f"{path}: rows differ"
+    else:
+        assert expected == actual, f"{path}: {expected!r} != {actual!r}"
+
+
+def check_rebuild(data, appended, table, store, index):
+    full = concat_matches([data] + appended)
+    same(full, table.data, "table")
+    rebuilt = AggregateStore(full)
+    same(rebuilt.years(), store.years(), "years")
+    for year in rebuilt.years():
+        same(rebuilt.year(year), store.year(year), f"year[{year}]")
+        for team in rebuilt.year(year)["teams"]:
+            same(rebuilt.team(year, team), store.team(year, team), f"team[{year}, {team!r}]")
+    same(HeadToHeadIndex(full)._pairs, index._pairs, "pairs")
+
+
+def bench_scale(base, scale, appends):
+    data = synthetic_matches(base, scale)
+    data = data.reset_index(drop=True)
+
+    start = time.perf_counter()
+    store = AggregateStore(data)
+    index = HeadToHeadIndex(data)
+    leaderboards = PlayerLeaderboards(data)
+    build_seconds = time.perf_counter() - start
+
+    appended = []
+    table = MatchTable(data)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "matches.csv")
+        data.head(0).to_csv(path, index=False, columns=MATCH_COLUMNS)
+        ingest = LiveIngest(append_rows=table_appender(path, table))
+        for listener in (store.append, index.append, leaderboards.append, appended.append):
+            ingest.add_listener(listener)
+
+        samples = []
+        for record in records(data, appends, seed=scale):
+            start = time.perf_counter()
+            ingest.append(record)
+            samples.append((time.perf_counter() - start) * 1000)
+
+    check_rebuild(data, appended, table, store, index)
+    samples.sort()
+    year_rows = data["world_cup_year"].value_counts().median()
+    print(
+        f"{scale:>6}x {len(data):>9} rows ({year_rows:>7.0f} per year): build {build_seconds:>7.2f} s, "
+        f"append median {samples[len(samples) // 2]:>6.2f} ms, max {samples[-1]:>6.2f} ms "
+        f"over {appends} appends, matches a full rebuild"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--appends", type=int, default=50, help="single-match appends per scale")
+    args = parser.parse_args()
+
+    base = get_matches()
+    for scale in args.scales:
+        bench_scale(base, scale, args.appends)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Check serialized figure sizes against payload budgets on the 100x synthetic table.
+
+Builds every chart the dashboard serves over the synthetic table from suite.py
+(each main page category, and the details page for the median year with no
+team picked and with each of its first teams), plus a runs-vs-wickets scatter
+over all of one team's matches, which is large enough to switch to WebGL.
+Each figure's JSON size is compared with its budget, and the script exits
+non-zero when any figure is over. The per-match charts are also built the way
+they were before slimming (one element per match, full template, SVG) to
+show the reduction.
+
+Run from the repository root:
+
+    python benchmarks/payload_budget.py --scale 100
+
+The same check at the default scale runs as a test, for CI:
+
+    python -m pytest benchmarks/payload_budget.py
+"""
+import argparse
+import json
+import sys
+
+import plotly.express as px
+from plotly.utils import PlotlyJSONEncoder
+
+from suite import CATEGORIES, median_year, synthetic_matches
+
+import details_page  # noqa: E402
+import main_page  # noqa: E402
+from aggregates import AggregateStore, team_match_stats, team_view  # noqa: E402
+from figures import SCATTERGL_THRESHOLD  # noqa: E402
+
+# Plotly's own default, which figures.py replaces with the slim dashboard template
+FULL_TEMPLATE = "plotly"
+
+# Synthetic table scale and teams of the median year checked besides the winner
+SCALE = 100
+TEAMS = 5
+
+# Bytes allowed per serialized figure
+BUDGETS = {
+    "main.team_runs": 150_000,
+    "main.winners": 4_000,
+    "details.match_type_summary": 4_000,
+    "details.team_performance": 12_000,
+    "details.runs_vs_wickets": 8_000,
+    "details.venue_performance": 12_000,
+    "details.team1_vs_others": 40_000,
+    "all_matches.runs_vs_wickets": 40_000,
+}
+
+
+def size(fig):
+    return len(json.dumps(fig, cls=PlotlyJSONEncoder))
+
+
+def figure_sizes(data, teams):
+    """Largest serialized size per figure name over the inputs checked."""
+    sizes = {}
+
+    def record(name, fig):
+        sizes[name] = max(sizes.get(name, 0), size(fig))
+
+    for category in CATEGORIES:
+        team_runs, winners = main_page.plot_category_charts(main_page.filter_category(data, category))
+        record("main.team_runs", team_runs)
+        record("main.winners", winners)
+
+    year = median_year(data)
+    store = AggregateStore(data[data["world_cup_year"] == year])
+    year_stats = store.year(year)
+    record("details.match_type_summary", details_page.plot_match_type_summary(year_stats["category_counts"]))
+    record("details.team_performance", details_page.plot_team_performance(year_stats["team_totals"]))
+    record("details.team1_vs_others", details_page.create_team1_vs_others_chart(data[data["world_cup_year"] == year], None))
+    for team in [year_stats["winner"]] + year_stats["teams"][:teams]:
+        team_stats = store.team(year, team)
+        if team_stats is None:
+            continue
+        record("details.runs_vs_wickets", details_page.plot_runs_vs_wickets(team_stats["matches"], team))
+        record("details.venue_performance", details_page.plot_venue_performance(team_stats["venues"], team))
+
+    # Every match of the busiest team, past the WebGL threshold
+    view = team_view(data)
+    team = view["team"].value_counts().index[0]
+    matches = team_match_stats(view, team)
+    fig = details_page.plot_runs_vs_wickets(matches, team)
+    if len(matches) > SCATTERGL_THRESHOLD and fig.data[0].type != "scattergl":
+        raise RuntimeError(f"{len(matches)} points for {team} drawn as {fig.data[0].type}, expected scattergl")
+    record("all_matches.runs_vs_wickets", fig)
+    return sizes, year, team
+
+
+def unslimmed_sizes(data, year, team):
+    """Sizes of the per-match charts as they were built before slimming, with Plotly's full default template."""
+    league = main_page.filter_category(data, "League-Match")
+    year_data = data[data["world_cup_year"] == year]
+    return {
+        "main.team_runs": size(px.bar(league, x="team_1", y="team_1_runs", color="winning_team", template=FULL_TEMPLATE)),
+        "main.winners": size(px.pie(league, names="winning_team", template=FULL_TEMPLATE)),
+        "details.team1_vs_others": size(px.bar(year_data, x="team_2", y="team_2_runs", color="team_1", template=FULL_TEMPLATE)),
+        "all_matches.runs_vs_wickets": size(
+            px.scatter(team_match_stats(team_view(data), team), x="runs", y="wickets", render_mode="svg", template=FULL_TEMPLATE)
+        ),
+    }
+
+
+def over_budget(sizes):
+    """Names of the figures larger than their budget."""
+    return [name for name, budget in BUDGETS.items() if sizes[name] > budget]
+
+
+def test_payload_budget():
+    data = synthetic_matches(details_page.get_matches(), SCALE)
+    sizes, _, _ = figure_sizes(data, TEAMS)
+    over = over_budget(sizes)
+    assert not over, ", ".join(f"{name} {sizes[name]} B > {BUDGETS[name]} B" for name in over)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=SCALE)
+    parser.add_argument("--teams", type=int, default=TEAMS, help="teams of the median year checked besides the winner")
+    args = parser.parse_args()
+
+    data = synthetic_matches(details_page.get_matches(), args.scale)
+    sizes, year, team = figure_sizes(data, args.teams)
+    unslimmed = unslimmed_sizes(data, year, team)
+    print(f"{args.scale}x: {len(data)} rows, details for {year}, all-match scatter for {team}")
+
+    over = over_budget(sizes)
+    for name, budget in BUDGETS.items():
+        status = "OVER" if name in over else "ok"
+        before = f"  (unslimmed {unslimmed[name]} B)" if name in unslimmed else ""
+        print(f"  {name:<30} {sizes[name]:>9} B  budget {budget:>9} B  {status}{before}")
+    if over:
+        sys.exit(f"over budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Time the dashboard data paths on synthetic match tables at several scales.
+
+Each scale builds a table with the crick_df_cleaned.csv schema. At 1x it is
+the real table; larger scales resample its rows over more years, teams and
+venues, so per-year slices grow roughly with the square root of the scale.
+Every figure builder of the details page, the main page category filter and
+charts, the CSV load (cold parse and warm binary cache) and, optionally,
+sentiment inference throughput are timed. Results are written as JSON so runs
+can be compared with --compare.
+
+Run from the repository root:
+
+    python benchmarks/suite.py --scales 1 100 10000
+    python benchmarks/suite.py --compare benchmarks/results/<earlier run>.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+# The dashboard modules use paths relative to the dashboard directory
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Paths given on the command line are relative to where the script was started
+START_DIR = os.getcwd()
+sys.path.insert(0, DASHBOARD_DIR)
+os.chdir(DASHBOARD_DIR)
+
+import details_page  # noqa: E402
+import main_page  # noqa: E402
+from aggregates import AggregateStore, final_winner, team_match_stats, team_totals, team_view, venue_totals  # noqa: E402
+from dataset import compact, load_matches, read_csv  # noqa: E402
+from players import METRICS, PlayerLeaderboards  # noqa: E402
+
+COMMENTARY_PATH = "../data/commentary_2023.csv"
+CATEGORIES = ["League-Match", "Semi-Final", "Final"]
+
+
+def synthetic_matches(base, scale, seed=0):
+    """A match table `scale` times the size of `base`, spread over more years, teams and venues.
+
+    Rewritten columns are built from categorical codes, so 10,000x fits in a
+    few hundred MB.
+    """
+    if scale == 1:
+        return base.copy()
+
+    rng = np.random.default_rng(seed)
+    rows = len(base) * scale
+    growth = math.ceil(math.sqrt(scale))
+    data = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+
+    # Contiguous blocks of rows per year, each opening with its final
+    years = base["world_cup_year"].nunique() * growth
+    data["world_cup_year"] = 1975 + np.arange(rows) * years // rows
+    firsts = np.flatnonzero(np.diff(data["world_cup_year"].to_numpy(), prepend=-1))
+    categories = list(base["match_category"].cat.categories)
+    codes = data["match_category"].cat.codes.to_numpy().copy()
+    codes[codes == categories.index("Final")] = categories.index("League-Match")
+    codes[firsts] = categories.index("Final")
+    data["match_category"] = pd.Categorical.from_codes(codes, categories)
+
+    # Real teams plus synthetic ones; team_2 is always a different team
+    real_teams = sorted(pd.concat([base["team_1"], base["team_2"]]).astype(str).unique())
+    teams = real_teams + [f"T{i:03d}" for i in range(len(real_teams) * (math.ceil(scale ** 0.25) - 1))]
+    first = rng.integers(0, len(teams), rows)
+    second = (first + rng.integers(1, len(teams), rows)) % len(teams)
+    data["team_1"] = pd.Categorical.from_codes(first, teams)
+    data["team_2"] = pd.Categorical.from_codes(second, teams)
+
+    venues = [f"{venue} #{k}" for venue in base["venue"].astype(str).unique() for k in range(growth)]
+    data["venue"] = pd.Categorical.from_codes(rng.integers(0, len(venues), rows), venues)
+
+    # Higher score wins a played match; the final of every year is won by team_1
+    played = data["match_status"].to_numpy() == "played"
+    winner = np.where(data["team_1_runs"].to_numpy() > data["team_2_runs"].to_numpy(), first, second)
+    winner = np.where(played, winner, len(teams))
+    winner[firsts] = first[firsts]
+    data["winning_team"] = pd.Categorical.from_codes(winner, teams + ["Unknown"])
+    return compact(data)
+
+
+def measure(func, repeat):
+    """Median and minimum wall time of `repeat` calls, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {"median_ms": round(samples[len(samples) // 2], 3), "min_ms": round(samples[0], 3), "repeat": repeat}
+
+
+def median_year(data):
+    """The year whose match count is the median, a representative details page input."""
+    counts = data["world_cup_year"].value_counts().sort_values(kind="stable")
+    return counts.index[len(counts) // 2]
+
+
+def bench_details(data, repeat):
+    """Time every details page figure builder on one representative year."""
+    year = median_year(data)
+    filtered_data = data[data["world_cup_year"] == year]
+    winner = final_winner(filtered_data)
+    view = team_view(filtered_data)
+    totals = team_totals(view)
+    category_counts = filtered_data.groupby("match_category", sort=False, observed=True).size().reset_index(name="matches")
+    matches = team_match_stats(view, winner)
+    venues = venue_totals(view, winner)
+    leaderboards = PlayerLeaderboards(filtered_data)
+
+    timings = {
+        "details.filter_year": measure(lambda: data[data["world_cup_year"] == year], repeat),
+        "details.create_team_performance_chart": measure(lambda: details_page.create_team_performance_chart(filtered_data), repeat),
+        "details.plot_team_performance": measure(lambda: details_page.plot_team_performance(totals), repeat),
+        "details.create_world_cup_match_type_summary_chart": measure(lambda: details_page.create_world_cup_match_type_summary_chart(filtered_data), repeat),
+        "details.plot_match_type_summary": measure(lambda: details_page.plot_match_type_summary(category_counts), repeat),
+        "details.create_team1_vs_others_chart": measure(lambda: details_page.create_team1_vs_others_chart(filtered_data, winner), repeat),
+        "details.create_runs_vs_wickets_chart": measure(lambda: details_page.create_runs_vs_wickets_chart(filtered_data, None, winner), repeat),
+        "details.plot_runs_vs_wickets": measure(lambda: details_page.plot_runs_vs_wickets(matches, winner), repeat),
+        "details.create_venue_performance_chart": measure(lambda: details_page.create_venue_performance_chart(filtered_data, None, winner), repeat),
+        "details.plot_venue_performance": measure(lambda: details_page.plot_venue_performance(venues, winner), repeat),
+        "details.create_leaderboard_table": measure(
+            lambda: [details_page.create_leaderboard_table(leaderboards.leaderboard(metric), metric) for metric in METRICS], repeat
+        ),
+    }
+    return {"year": int(year), "year_rows": len(filtered_data)}, timings
+
+
+def bench_main(data, repeat, max_figure_rows):
+    """Time the main page category filter and, below the row limit, its charts."""
+    timings = {}
+    for category in CATEGORIES:
+        timings[f"main.filter_category[{category}]"] = measure(lambda: main_page.filter_category(data, category), repeat)
+        filtered_data = main_page.filter_category(data, category)
+        if len(filtered_data) <= max_figure_rows:
+            timings[f"main.plot_category_charts[{category}]"] = measure(lambda: main_page.plot_category_charts(filtered_data), repeat)
+        else:
+            timings[f"main.plot_category_charts[{category}]"] = {"skipped": f"{len(filtered_data)} rows > --max-figure-rows"}
+    return timings
+
+
+def bench_stores(data, repeat):
+    """Time the precomputed structures the callbacks read from."""
+    return {
+        "data.player_leaderboards_build": measure(lambda: PlayerLeaderboards(data), repeat),
+        "data.aggregate_store_build": measure(lambda: AggregateStore(data), repeat),
+    }
+
+
+def bench_load(data, repeat):
+    """Time parsing the CSV, a cold load that writes the binary cache, and a warm cache hit."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "matches.csv")
+        data.to_csv(path)
+        cache_dir = os.path.join(tmp, "cache")
+        timings = {"load.read_csv": measure(lambda: read_csv(path), repeat)}
+        timings["load.cold"] = measure(lambda: load_matches(path, cache_dir + str(time.perf_counter_ns())), repeat)
+        load_matches(path, cache_dir)
+        timings["load.warm"] = measure(lambda: load_matches(path, cache_dir), repeat)
+        timings["load.csv_bytes"] = os.path.getsize(path)
+    return timings
+
+
+def bench_inference(count):
+    """Sentiment requests per second through a batching service with caching disabled."""
+    from inference_service import BatchInferenceService
+    from result_cache import TTLCache
+
+    texts = pd.read_csv(COMMENTARY_PATH)["commentary"].dropna().astype(str)
+    texts = [f"{text} from Australia" for text in texts.sample(n=count, replace=True, random_state=0)]
+    service = BatchInferenceService(cache=TTLCache(maxsize=1, ttl=0))
+    try:
+        service.predict(texts[0], "Australia")
+    except Exception as error:  # models missing or not loadable here
+        return {"inference": {"skipped": f"{type(error).__name__}: {error}"}}
+
+    start = time.perf_counter()
+    futures = [service.submit(text, "Australia") for text in texts]
+    for future in futures:
+        future.result()
+    seconds = time.perf_counter() - start
+    stats = service.metrics()
+    return {"inference": {
+        "requests": count,
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(count / seconds, 2),
+        "mean_batch_size": stats["mean_batch_size"],
+    }}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales, repeat, max_figure_rows, inference, skip_load):
+    base = details_page.get_matches()
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "scales": {},
+    }
+    for scale in scales:
+        start = time.perf_counter()
+        data = synthetic_matches(base, scale)
+        shape = {
+            "rows": len(data),
+            "years": int(data["world_cup_year"].nunique()),
+            "teams": int(pd.concat([data["team_1"], data["team_2"]]).nunique()),
+            "venues": int(data["venue"].nunique()),
+            "generate_seconds": round(time.perf_counter() - start, 3),
+        }
+        print(f"{scale}x: {shape['rows']} rows, {shape['years']} years, {shape['teams']} teams, {shape['venues']} venues")
+
+        details_shape, timings = bench_details(data, repeat)
+        shape.update(details_shape)
+        timings.update(bench_main(data, repeat, max_figure_rows))
+        timings.update(bench_stores(data, 1 if scale > 100 else repeat))
+        if not skip_load:
+            timings.update(bench_load(data, 1 if scale > 100 else repeat))
+        for name, timing in timings.items():
+            if isinstance(timing, dict) and "median_ms" in timing:
+                print(f"  {name:<58} {timing['median_ms']:>10.2f} ms")
+            elif isinstance(timing, dict) and "skipped" in timing:
+                print(f"  {name:<58} skipped ({timing['skipped']})")
+        results["scales"][str(scale)] = dict(shape, timings=timings)
+
+    if inference:
+        results.update(bench_inference(inference))
+        print(f"inference: {results['inference']}")
+    return results
+
+
+def compare(current, previous):
+    """Print the median time ratio of every timing present in both runs."""
+    print(f"compared with {previous.get('commit')} ({previous.get('created')}):")
+    for scale, entry in current["scales"].items():
+        before = previous.get("scales", {}).get(scale, {}).get("timings", {})
+        for name, timing in entry["timings"].items():
+            old = before.get(name)
+            if isinstance(timing, dict) and isinstance(old, dict) and "median_ms" in timing and "median_ms" in old:
+                ratio = timing["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+                flag = "  <-- slower" if ratio > 1.2 else ""
+                print(f"  {scale}x {name:<58} {old['median_ms']:>10.2f} -> {timing['median_ms']:>10.2f} ms ({ratio:.2f}x){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=5, help="calls per timing; the median is reported")
+    parser.add_argument("--max-figure-rows", type=int, default=1_000_000,
+                        help="skip main page charts over more filtered rows than this")
+    parser.add_argument("--inference", type=int, default=0, metavar="N",
+                        help="also measure sentiment throughput over N commentary lines")
+    parser.add_argument("--skip-load", action="store_true", help="do not time CSV and cache loading")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.repeat, args.max_figure_rows, args.inference, args.skip_load)
+
+    if args.output:
+        output = os.path.join(START_DIR, args.output)
+    else:
+        output = os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(os.path.join(START_DIR, args.compare)) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import numpy as np
+import pandas as pd
+
+from dataset import concat_matches
+from precomputed import Precomputed
+
+
+def team_view(data):
+    """Long-format view of the match table with one row per (match, team).
+
+    Each match contributes a row for team_1 followed by a row for team_2, so the
+    view keeps the original match order. ``runs`` and ``wickets_lost`` are the
+    team's own innings, ``wickets_taken`` the opponent's wickets lost.
+    """
+    def interleave(first, second):
+        return np.column_stack([first.to_numpy(), second.to_numpy()]).ravel()
+
+    return pd.DataFrame({
+        "match": np.repeat(data.index.to_numpy(), 2),
+        "world_cup_year": np.repeat(data["world_cup_year"].to_numpy(), 2),
+        "venue": np.repeat(data["venue"].to_numpy(), 2),
+        "team": interleave(data["team_1"], data["team_2"]),
+        "opponent": interleave(data["team_2"], data["team_1"]),
+        "runs": interleave(data["team_1_runs"], data["team_2_runs"]),
+        "wickets_lost": interleave(data["team_1_wickets"], data["team_2_wickets"]),
+        "wickets_taken": interleave(data["team_2_wickets"], data["team_1_wickets"]),
+    })
+
+
+def team_totals(view):
+    """Total runs scored and wickets lost by every team in a team view."""
+    totals = view.groupby("team")[["runs", "wickets_lost"]].sum().reset_index()
+    return totals.rename(columns={"wickets_lost": "wickets"})
+
+
+def team_match_stats(view, team):
+    """Runs scored and wickets lost by a team, one row per match it played."""
+    return _match_stats(view[view["team"] == team])
+
+
+def venue_totals(view, team):
+    """Runs scored and wickets taken by a team at each venue, in order of first appearance."""
+    return _venue_totals(view[view["team"] == team])
+
+
+def _match_stats(team_rows):
+    return pd.DataFrame({
+        "runs": team_rows["runs"].to_numpy(),
+        "wickets": team_rows["wickets_lost"].to_numpy(),
+    })
+
+
+def _venue_totals(team_rows):
+    return (
+        team_rows.groupby("venue", sort=False, as_index=False)[["runs", "wickets_taken"]].sum()
+        .rename(columns={"venue": "Venue", "runs": "Runs", "wickets_taken": "Wickets"})
+    )
+
+
+def final_winner(filtered_data):
+    """Winner of the first match labelled as a final, or None if there is none."""
+    finals = filtered_data.loc[filtered_data["match_category"] == "Final", "winning_team"]
+    return finals.iloc[0] if len(finals) else None
+
+
+def _labels(*columns):
+    return np.array(sorted(set().union(*(pd.unique(column.dropna()) for column in columns))), dtype=object)
+
+
+def _codes(values, categories):
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+
+def _first_seen(keys):
+    """Distinct keys ordered by where they first appear, with their counts and first positions."""
+    unique, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    order = np.argsort(first, kind="stable")
+    return unique[order], counts[order], first[order]
+
+
+def _bounds(groups, count):
+    """Start offsets of each group in an array sorted by group id, plus the end."""
+    return np.concatenate([[0], np.cumsum(np.bincount(groups, minlength=count))])
+
+
+class _Aggregates:
+    """Every aggregate of a match table, as flat arrays with one slice per key.
+
+    Years index ``self.years``; a (year, team) pair is the group ``year * len(teams) + team``
+    over the sorted team names. Per-team rows are sorted by group, keeping match order,
+    and per-venue totals by group, keeping the order venues first appear in.
+    """
+
+    def __init__(self, data):
+        year_values = data["world_cup_year"].to_numpy()
+        self.years, year = np.unique(year_values, return_inverse=True)
+        self.teams = _labels(data["team_1"], data["team_2"])
+        self.team_index = {team: t for t, team in enumerate(self.teams)}
+        self.venues = _labels(data["venue"])
+        self.categories = data["match_category"].astype("category").cat.categories
+        years, teams = len(self.years), len(self.teams)
+
+        # Per year
+        self.total = np.bincount(year, minlength=years)
+        self.played = np.bincount(year[(data["match_status"] == "played").to_numpy()], minlength=years)
+        self.abandoned = np.bincount(year[(data["match_status"] == "abandoned").to_numpy()], minlength=years)
+        self.winner = np.full(years, None, dtype=object)
+        finals = np.flatnonzero((data["match_category"] == "Final").to_numpy())
+        final_years, first = np.unique(year[finals], return_index=True)
+        self.winner[final_years] = data["winning_team"].to_numpy()[finals[first]]
+
+        category = _codes(data["match_category"], self.categories)
+        keys, counts, _ = _first_seen((year * len(self.categories) + category)[category >= 0])
+        order = np.argsort(keys // len(self.categories), kind="stable")
+        self.category_codes, self.category_counts = keys[order] % len(self.categories), counts[order]
+        self.category_bounds = _bounds(keys // len(self.categories), years)
+
+        # Teams in the order they first appear, all team_1 entries before team_2's
+        team_1, team_2 = _codes(data["team_1"], self.teams), _codes(data["team_2"], self.teams)
+        both = np.concatenate([team_1, team_2])
+        keys, _, _ = _first_seen((np.concatenate([year, year]) * teams + both)[both >= 0])
+        self.year_teams = keys[np.argsort(keys // teams, kind="stable")] % teams
+        self.year_team_bounds = _bounds(keys // teams, years)
+
+        # Per (year, team): one row per match in match order, each match adding team_1 then team_2
+        team = np.column_stack([team_1, team_2]).ravel()
+        valid = team >= 0
+        group = (np.repeat(year, 2) * teams + team)[valid]
+
+        def interleave(first, second):
+            return np.column_stack([data[first].to_numpy(), data[second].to_numpy()]).ravel()[valid]
+
+        runs = interleave("team_1_runs", "team_2_runs")
+        wickets_lost = interleave("team_1_wickets", "team_2_wickets")
+        wickets_taken = interleave("team_2_wickets", "team_1_wickets")
+        order = np.argsort(group, kind="stable")
+        self.runs, self.wickets = runs[order], wickets_lost[order]
+        self.team_bounds = _bounds(group, years * teams)
+        self.team_runs = np.bincount(group, weights=runs, minlength=years * teams).astype(runs.dtype)
+        self.team_wickets = np.bincount(group, weights=wickets_lost, minlength=years * teams).astype(wickets_lost.dtype)
+
+        # Per (year, team, venue), venues in the order they first appear for the team
+        venue = np.repeat(_codes(data["venue"], self.venues), 2)[valid]
+        has_venue = venue >= 0
+        keys, first, inverse = np.unique((group * len(self.venues) + venue)[has_venue], return_index=True, return_inverse=True)
+        order = np.lexsort((first, keys // len(self.venues)))
+        self.venue_codes = (keys % len(self.venues))[order]
+        self.venue_runs = np.bincount(inverse, weights=runs[has_venue])[order].astype(runs.dtype)
+        self.venue_wickets = np.bincount(inverse, weights=wickets_taken[has_venue])[order].astype(wickets_taken.dtype)
+        self.venue_bounds = _bounds(keys // len(self.venues), years * teams)
+
+    def year_stats(self, i):
+        teams = self.teams[self.year_teams[self.year_team_bounds[i]:self.year_team_bounds[i + 1]]]
+        groups = i * len(self.teams) + np.arange(len(self.teams))
+        present = self.team_bounds[groups + 1] > self.team_bounds[groups]
+        start, end = self.category_bounds[i], self.category_bounds[i + 1]
+        return {
+            "winner": self.winner[i],
+            "total_matches": int(self.total[i]),
+            "played_matches": int(self.played[i]),
+            "abandoned_matches": int(self.abandoned[i]),
+            "teams": list(teams),
+            "category_counts": pd.DataFrame({
+                "match_category": pd.Categorical.from_codes(self.category_codes[start:end], dtype=pd.CategoricalDtype(self.categories)),
+                "matches": self.category_counts[start:end],
+            }),
+            "team_totals": pd.DataFrame({
+                "team": self.teams[present],
+                "runs": self.team_runs[groups[present]],
+                "wickets": self.team_wickets[groups[present]],
+            }),
+        }
+
+    def group(self, i, team):
+        t = self.team_index.get(team)
+        if t is None:
+            return None
+        group = i * len(self.teams) + t
+        return group if self.team_bounds[group + 1] > self.team_bounds[group] else None
+
+    def team_stats(self, group):
+        start, end = self.team_bounds[group], self.team_bounds[group + 1]
+        venues = slice(self.venue_bounds[group], self.venue_bounds[group + 1])
+        return {
+            "matches": pd.DataFrame({"runs": self.runs[start:end], "wickets": self.wickets[start:end]}),
+            "venues": pd.DataFrame({
+                "Venue": self.venues[self.venue_codes[venues]],
+                "Runs": self.venue_runs[venues],
+                "Wickets": self.venue_wickets[venues],
+            }),
+        }
+
+    def venue_stats(self, group, venue):
+        start = self.venue_bounds[group]
+        names = self.venues[self.venue_codes[start:self.venue_bounds[group + 1]]]
+        match = np.flatnonzero(names == venue)
+        if not len(match):
+            return None
+        return {"runs": self.venue_runs[start + match[0]], "wickets": self.venue_wickets[start + match[0]]}
+
+
+class AggregateStore(Precomputed):
+    """Per-year, per-(year, team) and per-(year, team, venue) aggregates built once from the match table.
+
+    The whole table is aggregated in one vectorized pass; lookups slice the
+    resulting arrays. Appended matches only recompute the year they belong to.
+    """
+
+    incremental = True
+
+    def _build(self, data):
+        aggregates = _Aggregates(data)
+        # Year -> (aggregates holding it, its index there); appends swap in a one-year _Aggregates
+        self._years = {int(year): (aggregates, i) for i, year in enumerate(aggregates.years)}
+        self._year_rows = {}
+        self._year_data = {}
+        order = np.argsort(data["world_cup_year"].to_numpy(), kind="stable")
+        bounds = np.searchsorted(data["world_cup_year"].to_numpy()[order], aggregates.years, side="right")
+        for i, year in enumerate(aggregates.years):
+            self._year_rows[int(year)] = order[(bounds[i - 1] if i else 0):bounds[i]]
+
+    def _year_frames(self, year):
+        if year not in self._year_data and year in self._year_rows:
+            self._year_data[year] = self._data.iloc[self._year_rows[year]]
+        return [self._year_data[year]] if year in self._year_data else []
+
+    def _append(self, rows):
+        for year, new_rows in rows.groupby("world_cup_year", sort=False):
+            year = int(year)
+            year_data = concat_matches(self._year_frames(year) + [new_rows])
+            self._year_data[year] = year_data
+            self._years[year] = (_Aggregates(year_data), 0)
+        self._years = dict(sorted(self._years.items()))
+
+    def years(self):
+        self.ensure_built()
+        return list(self._years)
+
+    def year(self, year):
+        """Aggregates for one tournament year."""
+        self.ensure_built()
+        aggregates, i = self._years[year]
+        return aggregates.year_stats(i)
+
+    def winner(self, year):
+        self.ensure_built()
+        aggregates, i = self._years[year]
+        return aggregates.winner[i]
+
+    def team(self, year, team):
+        """Per-match and per-venue aggregates for one team in one year."""
+        self.ensure_built()
+        if year not in self._years:
+            return None
+        aggregates, i = self._years[year]
+        group = aggregates.group(i, team)
+        return None if group is None else aggregates.team_stats(group)
+
+    def venue(self, year, team, venue):
+        """Runs scored and wickets taken by a team at one venue in one year."""
+        self.ensure_built()
+        if year not in self._years:
+            return None
+        aggregates, i = self._years[year]
+        group = aggregates.group(i, team)
+        return None if group is None else aggregates.venue_stats(group, venue)
@@ -0,0 +1,157 @@
+import functools
+import gzip
+import json
+import threading
+from datetime import datetime, timezone
+
+from flask import Blueprint, Response, abort, request
+
+from dataset import dataset_modified, dataset_version, get_matches
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+
+_bodies = {}
+_bodies_lock = threading.Lock()
+
+
+def _to_json(value):
+    # numpy scalars and arrays from pandas aggregates
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "to_dict"):
+        return value.to_dict(orient="records")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    return request.if_modified_since is not None and last_modified <= request.if_modified_since
+
+
+def cached_json(view):
+    """Serve a view's result as JSON with ETag/Last-Modified tied to the dataset version.
+
+    Conditional requests that still match get a 304 without calling the view,
+    and each (view arguments, dataset version) is serialized and compressed only
+    once. Query strings are ignored, so they cannot grow the cache.
+    """
+    @functools.wraps(view)
+    def wrapper(**kwargs):
+        etag = dataset_version()
+        last_modified = datetime.fromtimestamp(int(dataset_modified()), tz=timezone.utc)
+
+        if _not_modified(etag, last_modified):
+            response = Response(status=304)
+        else:
+            key = (view.__name__, tuple(sorted(kwargs.items())), etag)
+            with _bodies_lock:
+                bodies = _bodies.get(key)
+            if bodies is None:
+                result = view(**kwargs)
+                if result is None:
+                    abort(404)
+                body = json.dumps(result, default=_to_json).encode("utf-8")
+                bodies = (body, gzip.compress(body) if len(body) >= GZIP_MIN_BYTES else None)
+                with _bodies_lock:
+                    # Drop bodies from older dataset versions
+                    for stale in [k for k in _bodies if k[-1] != etag]:
+                        del _bodies[stale]
+                    _bodies[key] = bodies
+
+            body, compressed = bodies
+            response = Response(body, mimetype="application/json")
+            if compressed is not None and "gzip" in request.accept_encodings:
+                response.set_data(compressed)
+                response.headers["Content-Encoding"] = "gzip"
+            response.vary.add("Accept-Encoding")
+
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
+
+
+def _year_summary(year, stats):
+    return {
+        "year": int(year),
+        "winner": stats["winner"],
+        "total_matches": stats["total_matches"],
+        "played_matches": stats["played_matches"],
+        "abandoned_matches": stats["abandoned_matches"],
+    }
+
+
+def create_api(aggregate_store, head_to_head_index):
+    """Read-only JSON routes over the same aggregates the dashboard pages use."""
+    api = Blueprint("api", __name__, url_prefix="/api")
+
+    @api.route("/years")
+    @cached_json
+    def years():
+        return [_year_summary(year, aggregate_store.year(year)) for year in aggregate_store.years()]
+
+    @api.route("/years/<int:year>")
+    @cached_json
+    def year_detail(year):
+        if year not in aggregate_store.years():
+            return None
+        stats = aggregate_store.year(year)
+        return dict(
+            _year_summary(year, stats),
+            teams=stats["teams"],
+            team_totals=stats["team_totals"],
+            match_categories=stats["category_counts"],
+        )
+
+    @api.route("/years/<int:year>/teams/<team>")
+    @cached_json
+    def team_detail(year, team):
+        stats = aggregate_store.team(year, team)
+        if stats is None:
+            return None
+        return {
+            "year": year,
+            "team": team,
+            "matches": stats["matches"],
+            "venues": stats["venues"],
+        }
+
+    @api.route("/categories/<category>")
+    @cached_json
+    def category(category):
+        data = get_matches()
+        filtered_data = data[data["match_category"] == category]
+        if filtered_data.empty:
+            return None
+        winners = filtered_data["winning_team"].value_counts().loc[lambda counts: counts > 0].to_dict()
+        team_1_runs = filtered_data.groupby("team_1", observed=True)["team_1_runs"].sum().to_dict()
+        # Ordered explicitly: live appends add categories out of alphabetical order
+        return {
+            "category": category,
+            "matches": len(filtered_data),
+            "winners": dict(sorted(winners.items(), key=lambda item: (-item[1], item[0]))),
+            "team_1_runs": dict(sorted(team_1_runs.items())),
+        }
+
+    @api.route("/head-to-head/<team1>/<team2>")
+    @cached_json
+    def head_to_head(team1, team2):
+        record = head_to_head_index.matchup(team1, team2)
+        if record is None:
+            return None
+        return {
+            "teams": [team1, team2],
+            "all_time": record["all_time"],
+            "years": {str(year): summary for year, summary in record["years"].items()},
+        }
+
+    return api
+
+
+def register_api_routes(server, aggregate_store, head_to_head_index):
+    """Mount the JSON API on the Flask server behind the Dash app."""
+    server.register_blueprint(create_api(aggregate_store, head_to_head_index))
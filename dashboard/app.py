@@ -1,30 +1,74 @@
+import os
+import time
+
+import startup_profile
+
+# STARTUP_PROFILE=1 times every import and startup stage and prints a breakdown
+if startup_profile.ENABLED:
+    PROCESS_START = time.perf_counter()
+    startup_profile.install()
+
 from dash import Dash, dcc, html, Input, Output
-from main_page import get_main_page_layout, register_main_page_callbacks
-from details_page import get_details_page_layout, register_details_page_callbacks
+from model_registry import registry, format_stats
+from main_page import get_main_page_layout, register_main_page_callbacks, head_to_head_index
+from details_page import get_details_page_layout, register_details_page_callbacks, aggregate_store
+from api import register_api_routes
+from metrics import register_metrics_endpoint, timed
+from client_data import CLIENTSIDE_FILTERING, match_data_store
+from live import DROP_DIR, live_ingest, register_live_routes
 
 # Initialize the app
 app = Dash(__name__, suppress_callback_exceptions=True)
 app.title = "Cricket World Cup Dashboard"
 
 # App layout with routing
-app.layout = html.Div([
-    dcc.Location(id="url", refresh=False),
-    html.Div(id="page-content"),
-])
+def serve_layout():
+    children = [
+        dcc.Location(id="url", refresh=False),
+        html.Div(id="page-content"),
+    ]
+    # Match table for the clientside chart callbacks, sent once per page load
+    if CLIENTSIDE_FILTERING:
+        children.append(match_data_store())
+    return html.Div(children)
+
+
+app.layout = serve_layout
 
 # Callbacks for routing
 @app.callback(
     Output("page-content", "children"),
     [Input("url", "pathname")],
 )
+@timed("callback")
 def display_page(pathname):
     if pathname == "/details":
         return get_details_page_layout()
     return get_main_page_layout()
 
 # Register callbacks for individual pages
-register_main_page_callbacks(app)
-register_details_page_callbacks(app)
+with startup_profile.stage("register callbacks"):
+    register_main_page_callbacks(app)
+    register_details_page_callbacks(app)
+
+# Read-only JSON API over the same aggregates
+register_api_routes(app.server, aggregate_store, head_to_head_index)
+
+# Live match appends over HTTP and, when LIVE_DROP_DIR is set, from a drop folder
+register_live_routes(app.server)
+if DROP_DIR:
+    live_ingest.watch(DROP_DIR)
+
+# Prometheus metrics for callbacks, figure builders and model inference
+register_metrics_endpoint(app)
+
+# Optionally load the NLP models at startup instead of on the first prediction
+if os.environ.get("WARM_UP_MODELS") == "1":
+    with startup_profile.stage("warm up models"):
+        print(format_stats(registry.warm_up()))
+
+if startup_profile.ENABLED:
+    print(startup_profile.report(process_start=PROCESS_START))
 
 # Run the app
 if __name__ == "__main__":
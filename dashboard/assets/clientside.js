@@ -0,0 +1,287 @@
+/*
+ * Clientside versions of the main page and details page chart callbacks,
+ * used when the app runs with CLIENTSIDE_FILTERING=1. They read the
+ * integer-coded match table shipped once in the "match-data" store (see
+ * client_data.py) and build the same traces as the Plotly Express figures
+ * in main_page.py and details_page.py, so no request reaches the server.
+ */
+(function () {
+    // Label of row i in a coded column; team columns share one dictionary
+    function label(store, column, i) {
+        var dictionary = column === "team_1" || column === "team_2" || column === "winning_team" ? "team" : column;
+        return store.categories[dictionary][store.columns[column][i]];
+    }
+
+    // Positions of the rows whose coded column holds the given label
+    function rowsWhere(store, column, value) {
+        var code = store.categories[column].indexOf(value);
+        var codes = store.columns[column];
+        var rows = [];
+        for (var i = 0; i < codes.length; i++) {
+            if (codes[i] === code) {
+                rows.push(i);
+            }
+        }
+        return rows;
+    }
+
+    function colorway(store) {
+        return store.template.layout.colorway;
+    }
+
+    // Figure data is rounded to two decimals on the server
+    function round(values) {
+        return values.map(function (value) { return Math.round(value * 100) / 100; });
+    }
+
+    function barTrace(name, x, y, hovertemplate, color, textAuto) {
+        var trace = {
+            alignmentgroup: "True",
+            hovertemplate: hovertemplate,
+            legendgroup: name,
+            marker: {color: color},
+            name: name,
+            offsetgroup: name,
+            orientation: "v",
+            textposition: "auto",
+            x: x,
+            y: round(y),
+            type: "bar"
+        };
+        if (textAuto) {
+            trace.texttemplate = "%{y}";
+        }
+        return trace;
+    }
+
+    function pieTrace(hovertemplate, labels, values) {
+        return {
+            hovertemplate: hovertemplate,
+            labels: labels,
+            name: "",
+            values: round(values),
+            type: "pie"
+        };
+    }
+
+    function axes(xTitle, yTitle) {
+        return {
+            xaxis: {title: {text: xTitle}},
+            yaxis: {title: {text: yTitle}}
+        };
+    }
+
+    function figure(store, data, layout) {
+        layout.template = store.template;
+        return {data: data, layout: layout};
+    }
+
+    // Wide-form grouped bars of two metrics per x value, as px.bar(y=[first, second]) draws them
+    function metricBars(store, x, first, second, xTitle, title) {
+        var colors = colorway(store);
+        var hover = "<br>" + xTitle + "=%{x}<br>Count=%{y}<extra></extra>";
+        var layout = axes(xTitle, "Count");
+        layout.legend = {title: {text: "Metric"}, tracegroupgap: 0};
+        layout.title = {text: title};
+        layout.barmode = "group";
+        return figure(store, [
+            barTrace(first.name, x, first.values, "Metric=" + first.name + hover, colors[0], true),
+            barTrace(second.name, x, second.values, "Metric=" + second.name + hover, colors[1], true)
+        ], layout);
+    }
+
+    function categoryCharts(store, category) {
+        var rows = rowsWhere(store, "match_category", category);
+        var colors = colorway(store);
+
+        // One bar trace per winning team and one bar per team in it, summed like
+        // the server's groupby, both in order of first appearance
+        var groups = {};
+        var order = [];
+        rows.forEach(function (i) {
+            var winner = label(store, "winning_team", i);
+            if (!(winner in groups)) {
+                groups[winner] = {matches: 0, teams: [], runs: {}};
+                order.push(winner);
+            }
+            var group = groups[winner];
+            var team = label(store, "team_1", i);
+            if (!(team in group.runs)) {
+                group.runs[team] = 0;
+                group.teams.push(team);
+            }
+            group.runs[team] += store.columns.team_1_runs[i];
+            group.matches += 1;
+        });
+        var bars = order.map(function (winner, k) {
+            var group = groups[winner];
+            return barTrace(
+                winner, group.teams, group.teams.map(function (team) { return group.runs[team]; }),
+                "winning_team=" + winner + "<br>Team=%{x}<br>Runs=%{y}<extra></extra>",
+                colors[k % colors.length], false
+            );
+        });
+        var barLayout = axes("Team", "Runs");
+        barLayout.legend = {title: {text: "winning_team"}, tracegroupgap: 0};
+        barLayout.title = {text: "Team Performance in Selected Match Category"};
+        barLayout.barmode = "relative";
+
+        var pieLayout = {legend: {tracegroupgap: 0}, title: {text: "Winning Teams Distribution"}};
+        return [
+            figure(store, bars, barLayout),
+            figure(store, [pieTrace(
+                "winning_team=%{label}<br>matches=%{value}<extra></extra>",
+                order,
+                order.map(function (winner) { return groups[winner].matches; })
+            )], pieLayout)
+        ];
+    }
+
+    function detailsPage(store, selectedYear, selectedTeam) {
+        var columns = store.columns;
+        var rows = [];
+        for (var i = 0; i < store.rows; i++) {
+            if (columns.world_cup_year[i] === selectedYear) {
+                rows.push(i);
+            }
+        }
+
+        var winner = null;
+        var played = 0;
+        var abandoned = 0;
+        var categories = [];
+        var categoryCounts = {};
+        var firstTeams = [];
+        var secondTeams = [];
+        var totals = {};
+        rows.forEach(function (i) {
+            var category = label(store, "match_category", i);
+            if (winner === null && category === "Final") {
+                winner = label(store, "winning_team", i);
+            }
+            var status = label(store, "match_status", i);
+            played += status === "played" ? 1 : 0;
+            abandoned += status === "abandoned" ? 1 : 0;
+            if (!(category in categoryCounts)) {
+                categoryCounts[category] = 0;
+                categories.push(category);
+            }
+            categoryCounts[category] += 1;
+
+            var team1 = label(store, "team_1", i);
+            var team2 = label(store, "team_2", i);
+            firstTeams.push(team1);
+            secondTeams.push(team2);
+            [[team1, columns.team_1_runs[i], columns.team_1_wickets[i]],
+             [team2, columns.team_2_runs[i], columns.team_2_wickets[i]]].forEach(function (side) {
+                var total = totals[side[0]] || (totals[side[0]] = {runs: 0, wickets: 0});
+                total.runs += side[1];
+                total.wickets += side[2];
+            });
+        });
+
+        // Team 1 sides in order, then Team 2 sides not seen yet, like pd.concat(...).unique()
+        var teams = [];
+        var seen = {};
+        firstTeams.concat(secondTeams).forEach(function (team) {
+            if (!seen[team]) {
+                seen[team] = true;
+                teams.push(team);
+            }
+        });
+
+        // Per-match and per-venue figures for the picked team, or the winner
+        var team = selectedTeam ? selectedTeam : winner;
+        var matchRuns = [];
+        var matchWickets = [];
+        var venues = [];
+        var venueTotals = {};
+        rows.forEach(function (i) {
+            var first = label(store, "team_1", i) === team;
+            if (!first && label(store, "team_2", i) !== team) {
+                return;
+            }
+            var runs = first ? columns.team_1_runs[i] : columns.team_2_runs[i];
+            matchRuns.push(runs);
+            matchWickets.push(first ? columns.team_1_wickets[i] : columns.team_2_wickets[i]);
+
+            var venue = label(store, "venue", i);
+            if (!(venue in venueTotals)) {
+                venueTotals[venue] = {runs: 0, wickets: 0};
+                venues.push(venue);
+            }
+            venueTotals[venue].runs += runs;
+            venueTotals[venue].wickets += first ? columns.team_2_wickets[i] : columns.team_1_wickets[i];
+        });
+
+        var sortedTeams = Object.keys(totals).sort();
+        var categorySummary = figure(store, [pieTrace(
+            "match_category=%{label}<br>matches=%{value}<extra></extra>",
+            categories,
+            categories.map(function (category) { return categoryCounts[category]; })
+        )], {legend: {tracegroupgap: 0}, title: {text: "Match Summary"}});
+
+        var teamPerformance = metricBars(
+            store, sortedTeams,
+            {name: "runs", values: sortedTeams.map(function (t) { return totals[t].runs; })},
+            {name: "wickets", values: sortedTeams.map(function (t) { return totals[t].wickets; })},
+            "team", "Total Runs and Wickets by Team"
+        );
+
+        var scatterLayout = axes("Runs Scored", "Wickets Loss");
+        scatterLayout.legend = {tracegroupgap: 0};
+        scatterLayout.title = {text: "Runs vs Wickets of " + team};
+        // WebGL above the same point count as the server figure
+        var scatter = {
+            hovertemplate: "Runs Scored=%{x}<br>Wickets Loss=%{y}<extra></extra>",
+            marker: {color: colorway(store)[0], symbol: "circle"},
+            mode: "markers",
+            name: "",
+            showlegend: false,
+            x: round(matchRuns),
+            y: round(matchWickets),
+            type: matchRuns.length > store.scattergl_threshold ? "scattergl" : "scatter"
+        };
+        if (scatter.type === "scatter") {
+            scatter.orientation = "v";
+        }
+        var runsVsWickets = figure(store, [scatter], scatterLayout);
+
+        var venuePerformance = metricBars(
+            store, venues,
+            {name: "Runs", values: venues.map(function (v) { return venueTotals[v].runs; })},
+            {name: "Wickets", values: venues.map(function (v) { return venueTotals[v].wickets; })},
+            "Venue", "Venue Performance of " + team
+        );
+
+        return [
+            "Winning Team: " + (winner === null ? "None" : winner),
+            "Total Matches: " + rows.length,
+            "Played Matches: " + played,
+            "Abandoned Matches: " + abandoned,
+            categorySummary,
+            teamPerformance,
+            runsVsWickets,
+            venuePerformance,
+            teams
+        ];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        worldcup: {
+            update_charts: function (leagueClicks, semiFinalClicks, finalClicks, store) {
+                // Same rule as the server callback: the clicked button, or Final on first load
+                var context = window.dash_clientside.callback_context;
+                var triggered = context && context.triggered && context.triggered.length ? context.triggered[0].prop_id : ".";
+                var category = triggered === "." ? "Final" : triggered.split(".")[0];
+                return categoryCharts(store, category);
+            },
+            update_details_page: function (selectedYear, selectedTeam, store) {
+                if (selectedYear === null || selectedYear === undefined) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                return detailsPage(store, selectedYear, selectedTeam);
+            }
+        }
+    });
+})();
@@ -0,0 +1,62 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+from dash import dcc
+
+from dataset import dataset_version, get_matches
+from figures import SCATTERGL_THRESHOLD, slim_template
+
+# CLIENTSIDE_FILTERING=1 ships the match table to the browser once and filters it there
+CLIENTSIDE_FILTERING = os.environ.get("CLIENTSIDE_FILTERING") == "1"
+
+# Columns the clientside callbacks read; the three team columns share one dictionary
+TEAM_COLUMNS = ["team_1", "team_2", "winning_team"]
+CODED_COLUMNS = ["venue", "match_category", "match_status"]
+NUMBER_COLUMNS = ["world_cup_year", "team_1_runs", "team_1_wickets", "team_2_runs", "team_2_wickets"]
+
+
+def _codes(values, categories):
+    return pd.Categorical(values.astype(str), categories=categories).codes.tolist()
+
+
+def _numbers(values):
+    values = values.to_numpy()
+    # Whole numbers go out as JSON integers, which are shorter than floats
+    if np.all(np.mod(values, 1) == 0):
+        return values.astype(np.int64).tolist()
+    return np.round(values.astype(np.float64), 3).tolist()
+
+
+def encode_matches(data):
+    """Column-oriented match table with integer-coded text columns.
+
+    ``categories[name]`` lists the labels behind the codes in ``columns[name]``;
+    ``team_1``, ``team_2`` and ``winning_team`` all index ``categories["team"]``.
+    """
+    teams = sorted(set().union(*(data[column].astype(str).unique() for column in TEAM_COLUMNS)))
+    categories = {"team": teams}
+    columns = {}
+    for column in TEAM_COLUMNS:
+        columns[column] = _codes(data[column], teams)
+    for column in CODED_COLUMNS:
+        # Order of first appearance, which is also the order pandas groups by with sort=False
+        categories[column] = list(pd.unique(data[column].astype(str)))
+        columns[column] = _codes(data[column], categories[column])
+    for column in NUMBER_COLUMNS:
+        columns[column] = _numbers(data[column])
+    return {"rows": len(data), "categories": categories, "columns": columns}
+
+
+@functools.lru_cache(maxsize=1)
+def _store_data(version):
+    return dict(encode_matches(get_matches()), template=slim_template(), scattergl_threshold=SCATTERGL_THRESHOLD)
+
+
+def match_data_store():
+    """Store holding the encoded match table plus the template and WebGL threshold the server figures use.
+
+    Encoded once per dataset version, so page loads after a live append get the new matches.
+    """
+    return dcc.Store(id="match-data", data=_store_data(dataset_version()))
@@ -0,0 +1,340 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from startup_profile import stage
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DATA_PATH = "../data/crick_df_cleaned.csv"
+CACHE_DIR = "../data/cache"
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = [
+    "venue", "match_category", "team_1", "team_2", "pom", "host_country",
+    "match_status", "winning_team", "best_batter_1", "best_batter_2",
+    "best_baller_1", "best_baller_2",
+]
+# Numeric columns downcast to the smallest dtype that holds them
+FLOAT_COLUMNS = ["team_1_runs", "team_1_wickets", "team_2_runs", "team_2_wickets"]
+INT_COLUMNS = ["best_batter_1_runs", "best_batter_2_runs", "best_baller_1_wick", "best_baller_2_wick"]
+
+_lock = threading.Lock()
+_matches = None
+_version = None
+_modified = None
+# Column buffers behind _matches once live appends start, the next CSV id,
+# and how many appends happened
+_table = None
+_next_id = 0
+_revision = 0
+# Spare capacity factor when the column buffers fill up
+GROWTH = 1.5
+
+
+def file_digest(path):
+    """Content hash of a file, used as the dataset version."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def read_csv(path=DATA_PATH):
+    """Parse the CSV with pandas defaults, the way the pages used to."""
+    return pd.read_csv(path)
+
+
+def compact(data):
+    """Return a copy of the match table with categorical text and downcast numeric columns."""
+    data = data.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in data:
+            data[column] = data[column].astype("category")
+    for column in FLOAT_COLUMNS:
+        if column in data:
+            data[column] = pd.to_numeric(data[column], downcast="float")
+    for column in INT_COLUMNS:
+        if column in data:
+            data[column] = pd.to_numeric(data[column], downcast="integer")
+    return data
+
+
+def _cache_paths(path, cache_dir):
+    name = os.path.splitext(os.path.basename(path))[0]
+    extension = "feather" if HAS_PYARROW else "pkl"
+    return os.path.join(cache_dir, f"{name}.{extension}"), os.path.join(cache_dir, f"{name}.meta.json")
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _atomic_write(path, write):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_cache(data, cache_path, meta_path, meta):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    if HAS_PYARROW:
+        _atomic_write(cache_path, data.to_feather)
+    else:
+        _atomic_write(cache_path, data.to_pickle)
+
+    def write_meta(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    _atomic_write(meta_path, write_meta)
+
+
+def _read_cache(cache_path):
+    if HAS_PYARROW:
+        return pd.read_feather(cache_path)
+    return pd.read_pickle(cache_path)
+
+
+def load_matches(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Load the compact match table, rebuilding the binary cache when the CSV changed.
+
+    Returns the table and the dataset version (a content hash of the CSV).
+    """
+    cache_path, meta_path = _cache_paths(path, cache_dir)
+    stamp = _source_stamp(path)
+    meta = _read_meta(meta_path)
+
+    # Size and mtime match: trust the cache without rehashing the CSV
+    if meta is not None and os.path.exists(cache_path):
+        if meta.get("size") == stamp["size"] and meta.get("mtime_ns") == stamp["mtime_ns"]:
+            return _read_cache(cache_path), meta["version"]
+
+    version = file_digest(path)
+
+    # Touched but unchanged content: refresh the stamp and keep the cache
+    if meta is not None and os.path.exists(cache_path) and meta.get("version") == version:
+        data = _read_cache(cache_path)
+    else:
+        data = compact(read_csv(path))
+
+    try:
+        _write_cache(data, cache_path, meta_path, dict(stamp, version=version))
+    except OSError:
+        # A read-only checkout still works, just without the cache
+        pass
+    return data, version
+
+
+def concat_matches(frames):
+    """Stack match tables, keeping the compact dtypes and the row positions of the inputs."""
+    return compact(pd.concat(frames))
+
+
+def _code_dtype(categories):
+    # The dtype pandas keeps category codes in; other dtypes are copied on every read
+    return np.int8 if categories < 127 else np.int16 if categories < 32767 else np.int32
+
+
+class MatchTable:
+    """A compact match table kept in column buffers with spare room at the end.
+
+    Appended rows are written into the buffers in place, and ``data`` is a frame of
+    views over the filled part, so an append costs what the new rows cost rather
+    than a copy of the table. New categorical labels go after the existing
+    categories, so unlike ``compact`` the categories are not sorted.
+    """
+
+    def __init__(self, data):
+        self._rows = len(data)
+        self._columns = {}
+        self._categories = {}
+        for column in data.columns:
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                self._categories[column] = {label: code for code, label in enumerate(values.cat.categories)}
+                self._columns[column] = values.cat.codes.to_numpy()
+            else:
+                self._columns[column] = values.to_numpy()
+        self._dtypes = {}
+        self._grow(self._rows)
+        self.data = self._frame()
+
+    def __len__(self):
+        return self._rows
+
+    def _grow(self, rows):
+        capacity = max(rows, int(rows * GROWTH), 1024)
+        for column, values in self._columns.items():
+            buffer = np.empty(capacity, dtype=values.dtype)
+            buffer[:self._rows] = values[:self._rows]
+            self._columns[column] = buffer
+
+    def _frame(self):
+        columns = {}
+        for column, values in self._columns.items():
+            values = values[:self._rows]
+            if column in self._categories:
+                if column not in self._dtypes:
+                    self._dtypes[column] = pd.CategoricalDtype(list(self._categories[column]))
+                values = pd.Categorical.from_codes(values, dtype=self._dtypes[column], validate=False)
+            columns[column] = values
+        return pd.DataFrame(columns, copy=False)
+
+    def _encode(self, column, values):
+        categories = self._categories[column]
+        size = len(categories)
+        codes = np.array([-1 if pd.isna(label) else categories.setdefault(label, len(categories)) for label in values])
+        if len(categories) != size:
+            self._dtypes.pop(column, None)
+        return codes.astype(_code_dtype(len(categories)), copy=False)
+
+    def append(self, rows):
+        """Add rows holding the table's columns at its end; returns them indexed by their positions."""
+        end = self._rows + len(rows)
+        if end > len(next(iter(self._columns.values()))):
+            self._grow(end)
+        for column, buffer in self._columns.items():
+            if column in self._categories:
+                values = self._encode(column, rows[column])
+                wider = values.dtype.itemsize > buffer.dtype.itemsize
+            else:
+                values = pd.to_numeric(rows[column]).to_numpy() if buffer.dtype.kind in "fiu" else rows[column].to_numpy()
+                wider = not np.array_equal(values.astype(buffer.dtype), values, equal_nan=values.dtype.kind == "f")
+            if wider:
+                # More categories, or numbers the downcast dtype does not hold
+                buffer = buffer.astype(np.result_type(buffer.dtype, values.dtype))
+                self._columns[column] = buffer
+            buffer[self._rows:end] = values
+        self._rows = end
+        self.data = self._frame()
+        return self.data.iloc[end - len(rows):]
+
+
+def _load_shared():
+    global _matches, _version, _modified, _next_id
+    if _matches is None:
+        with _lock:
+            if _matches is None:
+                with stage("load match table"):
+                    _modified = os.stat(DATA_PATH).st_mtime
+                    _matches, _version = load_matches()
+                    _next_id = int(_matches["Unnamed: 0"].max()) + 1 if len(_matches) else 0
+
+
+def get_matches():
+    """The shared match table, loaded once per process, including live-appended matches."""
+    _load_shared()
+    return _matches
+
+
+def append_matches(rows, path=DATA_PATH):
+    """Append match rows to the CSV and to the shared table.
+
+    ``rows`` holds the CSV columns without the leading id column; new ids continue
+    after the largest one in the file. Returns the rows indexed by their positions
+    in the table.
+    """
+    global _matches, _table, _next_id, _revision, _modified
+    _load_shared()
+    with _lock:
+        ids = pd.RangeIndex(_next_id, _next_id + len(rows))
+        rows = rows.set_axis(ids)
+        with open(path, "rb+") as f:
+            # Keep the last existing line intact if the file lacks a final newline
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+        rows.to_csv(path, mode="a", header=False)
+
+        if _table is None:
+            _table = MatchTable(_matches)
+        rows = rows.reset_index(names="Unnamed: 0")
+        rows = _table.append(rows)
+        _matches = _table.data
+        _next_id += len(rows)
+        _revision += 1
+        _modified = time.time()
+    return rows
+
+
+def dataset_version():
+    """Content hash of the CSV behind the shared match table, plus the number of live appends."""
+    _load_shared()
+    return _version if not _revision else f"{_version}+{_revision}"
+
+
+def dataset_modified():
+    """Modification time (epoch seconds) of the CSV behind the shared match table."""
+    _load_shared()
+    return _modified
+
+
+def report(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Compare load time and memory of the raw CSV path against the compact cache."""
+    start = time.perf_counter()
+    raw = read_csv(path)
+    csv_seconds = time.perf_counter() - start
+
+    # First call makes sure the cache exists and is current
+    load_matches(path, cache_dir)
+    start = time.perf_counter()
+    data, version = load_matches(path, cache_dir)
+    cache_seconds = time.perf_counter() - start
+
+    raw_bytes = raw.memory_usage(deep=True).sum()
+    compact_bytes = data.memory_usage(deep=True).sum()
+    cache_path, _ = _cache_paths(path, cache_dir)
+    return {
+        "rows": len(data),
+        "version": version,
+        "cache_path": cache_path,
+        "csv_load_ms": csv_seconds * 1000,
+        "cache_load_ms": cache_seconds * 1000,
+        "csv_memory_bytes": int(raw_bytes),
+        "compact_memory_bytes": int(compact_bytes),
+        "memory_saved": 1 - compact_bytes / raw_bytes,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the compact match table cache and report savings.")
+    parser.add_argument("--path", default=DATA_PATH)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    stats = report(args.path, args.cache_dir)
+    print(f"rows: {stats['rows']} (version {stats['version']}, cache {stats['cache_path']})")
+    print(f"load time: csv {stats['csv_load_ms']:.1f} ms, cache {stats['cache_load_ms']:.1f} ms")
+    print(
+        f"memory: csv {stats['csv_memory_bytes'] / 1024:.0f} KiB, "
+        f"compact {stats['compact_memory_bytes'] / 1024:.0f} KiB ({stats['memory_saved']:.0%} saved)"
+    )
@@ -1,11 +1,28 @@
-from dash import html, dcc, Input, Output
+from dash import html, dcc, Input, Output, State, ClientsideFunction
 import plotly.express as px
 import pandas as pd
 
-# Load the dataset
-data = pd.read_csv("../data/crick_df_cleaned.csv")
+from figure_cache import cached_figures
+from metrics import timed
+from figures import render_mode, slimmed
+from dataset import get_matches
+from players import METRIC_LABELS, METRICS, PlayerLeaderboards
+from aggregates import AggregateStore, team_match_stats, team_totals, team_view, venue_totals
+from client_data import CLIENTSIDE_FILTERING
+from live import live_ingest
+
+# Per-year and per-team aggregates, built on first use
+aggregate_store = AggregateStore(get_matches(), lazy=True)
+
+# Player leaderboards from the best performer columns, built on first use
+player_leaderboards = PlayerLeaderboards(get_matches(), lazy=True)
+
+# Live-appended matches update the aggregates in place and the leaderboards on next use
+live_ingest.add_listener(aggregate_store.append)
+live_ingest.add_listener(player_leaderboards.append)
 
 def get_details_page_layout():
+    years = sorted(get_matches()["world_cup_year"].unique())
     return html.Div([
         # Header Section
         html.Div([
@@ -45,8 +62,8 @@ def get_details_page_layout():
             }),
             dcc.Dropdown(
                 id="year-dropdown",
-                options=[{"label": year, "value": year} for year in sorted(data["world_cup_year"].unique())],
-                value=sorted(data["world_cup_year"].unique())[0],
+                options=[{"label": year, "value": year} for year in years],
+                value=years[0],
                 clearable=False,
                 style={
                     "width": "100%", 
@@ -128,6 +145,22 @@ def get_details_page_layout():
             dcc.Graph(id="runs-vs-wickets-chart", style={"marginTop": "20px", "marginBottom": "20px", "flex": "1"}),
             dcc.Graph(id="venue-performance-chart", style={"marginTop": "20px", "marginBottom": "20px", "flex": "1"}),
         ], style={"display": "flex", "gap": "20px", "justifyContent": "space-around", "padding": "20px"}),
+
+        # Player Leaderboard Section
+        html.Div([
+            html.H4("Top Players", style={
+                "color": "#333", 
+                "fontWeight": "bold"
+            }),
+            dcc.RadioItems(
+                id="leaderboard-metric",
+                options=[{"label": METRIC_LABELS[metric], "value": metric} for metric in METRICS],
+                value="runs",
+                inline=True,
+                inputStyle={"marginRight": "5px", "marginLeft": "15px"},
+            ),
+            html.Div(id="leaderboard-table", style={"marginTop": "10px"}),
+        ], style={"backgroundColor": "#f1f1f1", "padding": "20px", "borderRadius": "10px", "margin": "20px"}),
     ], style={
         "fontFamily": "'Arial', sans-serif", 
         "lineHeight": "1.6", 
@@ -140,20 +173,15 @@ def get_details_page_layout():
 
 
 # Chart functions
+@timed("figure")
 def create_team_performance_chart(filtered_data):
     """Create a bar chart showing total runs and wickets by team."""
-    team_runs = pd.concat([
-        filtered_data[["team_1", "team_1_runs"]].rename(columns={"team_1": "team", "team_1_runs": "runs"}),
-        filtered_data[["team_2", "team_2_runs"]].rename(columns={"team_2": "team", "team_2_runs": "runs"}),
-    ])
-    team_wickets = pd.concat([
-        filtered_data[["team_1", "team_1_wickets"]].rename(columns={"team_1": "team", "team_1_wickets": "wickets"}),
-        filtered_data[["team_2", "team_2_wickets"]].rename(columns={"team_2": "team", "team_2_wickets": "wickets"}),
-    ])
-    total_runs = team_runs.groupby("team")["runs"].sum().reset_index()
-    total_wickets = team_wickets.groupby("team")["wickets"].sum().reset_index()
-    team_stats = pd.merge(total_runs, total_wickets, on="team")
+    return plot_team_performance(team_totals(team_view(filtered_data)))
 
+@timed("figure")
+@slimmed
+def plot_team_performance(team_stats):
+    """Plot precomputed team totals as grouped runs and wickets bars."""
     return px.bar(
         team_stats,
         x="team",
@@ -164,18 +192,34 @@ def create_team_performance_chart(filtered_data):
         text_auto=True,
     )
     
+@timed("figure")
 def create_world_cup_match_type_summary_chart(filtered_data):
     """Create a pie chart showing distribution of winning teams."""
+    category_counts = filtered_data.groupby("match_category", sort=False, observed=True).size().reset_index(name="matches")
+    return plot_match_type_summary(category_counts)
+
+@timed("figure")
+@slimmed
+def plot_match_type_summary(category_counts):
+    """Plot precomputed match counts per category as a pie chart."""
     return px.pie(
-        filtered_data,
+        category_counts,
         names="match_category",
+        values="matches",
         title="Match Summary",
     )
 
+@timed("figure")
+@slimmed
 def create_team1_vs_others_chart(filtered_data, selected_team):
     """Create a bar chart showing performance of selected team vs others."""
+    opponent_runs = (
+        filtered_data.groupby(["team_1", "team_2"], sort=False, observed=True)["team_2_runs"]
+        .sum()
+        .reset_index()
+    )
     return px.bar(
-        filtered_data,
+        opponent_runs,
         x="team_2",
         y="team_2_runs",
         color="team_1",
@@ -183,155 +227,143 @@ def create_team1_vs_others_chart(filtered_data, selected_team):
         labels={"team_2": "Opponent Team", "team_2_runs": "Runs Scored by Opponent"},
     )
 
+@timed("figure")
 def create_runs_vs_wickets_chart(filtered_data, selected_team, winning_team):
     
     """Create a scatter plot showing runs vs wickets."""
     
-    def team_performance_df(filtered_data, selected_team):
-        # Filter data for the selected team
-        team_data = filtered_data[(filtered_data["team_1"] == selected_team) | (filtered_data["team_2"] == selected_team)]
-        
-        # Initialize lists to store runs and wickets
-        runs_list = []
-        wickets_list = []
-
-        # Loop through the filtered data to calculate runs and wickets
-        for _, row in team_data.iterrows():
-            if row["team_1"] == selected_team:
-                runs_list.append(row["team_1_runs"])
-                wickets_list.append(row["team_1_wickets"])
-            elif row["team_2"] == selected_team:
-                runs_list.append(row["team_2_runs"])
-                wickets_list.append(row["team_2_wickets"])
-
-        # Create the DataFrame
-        return pd.DataFrame({
-            "runs": runs_list,
-            "wickets": wickets_list
-        })
-        
-    
-    if not selected_team:
-        data = team_performance_df(filtered_data, winning_team)
-    else:
-        data = team_performance_df(filtered_data, selected_team)
-    
-    
+    team = selected_team if selected_team else winning_team
+    return plot_runs_vs_wickets(team_match_stats(team_view(filtered_data), team), team)
+
+@timed("figure")
+@slimmed
+def plot_runs_vs_wickets(team_matches, team):
+    """Plot precomputed per-match runs and wickets for a team."""
     return px.scatter(
-        data,
+        team_matches,
         x="runs",
         y="wickets",
-        title=f"Runs vs Wickets of {selected_team}" if selected_team else f"Runs vs Wickets of {winning_team}",
+        title=f"Runs vs Wickets of {team}",
         labels={"runs": "Runs Scored", "wickets": "Wickets Loss"},
+        render_mode=render_mode(len(team_matches)),
     )
 
+@timed("figure")
 def create_venue_performance_chart(filtered_data, selected_team, winning_team):
     
     """Create a bar-plot showing venue-wise performance."""
     
-    def venue_performance_df(filtered_data, selected_team):
-        # Filter data for the selected team
-        team_data = filtered_data[(filtered_data["team_1"] == selected_team) | (filtered_data["team_2"] == selected_team)]
-        
-        # Initialize lists to store venue-wise data
-        venue_list = []
-        runs_list = []
-        wickets_list = []
-
-        # Loop through the filtered data to calculate runs and wickets by venue
-        for venue in team_data["venue"].unique():
-            venue_data = team_data[team_data["venue"] == venue]
-
-            # Calculate runs and wickets for the selected team in the current venue
-            runs = 0
-            wickets = 0
-
-            for _, row in venue_data.iterrows():
-                if row["team_1"] == selected_team:
-                    runs += row["team_1_runs"]
-                    wickets += row["team_2_wickets"]
-                elif row["team_2"] == selected_team:
-                    runs += row["team_2_runs"]
-                    wickets += row["team_1_wickets"]
-
-            # Append data to the lists
-            venue_list.append(venue)
-            runs_list.append(runs)
-            wickets_list.append(wickets)
-
-        # Create the DataFrame
-        return pd.DataFrame({
-            "Venue": venue_list,
-            "Runs": runs_list,
-            "Wickets": wickets_list
-        })
-    
-    if not selected_team:
-        venue_df = venue_performance_df(filtered_data, winning_team)
-        
-    else:
-        venue_df = venue_performance_df(filtered_data, selected_team)
-         
-    fig = px.bar(
+    team = selected_team if selected_team else winning_team
+    return plot_venue_performance(venue_totals(team_view(filtered_data), team), team)
+
+@timed("figure")
+@slimmed
+def plot_venue_performance(venue_df, team):
+    """Plot precomputed venue totals for a team."""
+    return px.bar(
         venue_df,
         x="Venue",
         y=["Runs", "Wickets"],
         barmode="group",
-        title=f"Venue Performance of {selected_team}" if selected_team else f"Venue Performance of {winning_team}",
+        title=f"Venue Performance of {team}",
         labels={"value": "Count", "variable": "Metric"},
         text_auto=True,
     )
-    return fig
+
+def create_leaderboard_table(rows, metric):
+    """Render leaderboard rows as a simple ranked table."""
+    if not rows:
+        return html.P("No player records for this selection.")
+    return html.Table([
+        html.Thead(html.Tr([html.Th("#"), html.Th("Player"), html.Th(METRIC_LABELS[metric])])),
+        html.Tbody([
+            html.Tr([html.Td(rank), html.Td(name), html.Td(value)])
+            for rank, (name, value) in enumerate(rows, start=1)
+        ]),
+    ], style={"width": "100%", "textAlign": "left"})
 
 def register_details_page_callbacks(app):
     """Register callbacks for the Details Page."""
+    outputs = [
+        Output("winning-team", "children"),
+        Output("total-matches", "children"),
+        Output("played-matches", "children"),
+        Output("abandoned", "children"),
+        Output("match-type-summary-chart", "figure"),
+        Output("team-performance-chart", "figure"),
+        Output("runs-vs-wickets-chart", "figure"),
+        Output("venue-performance-chart", "figure"),
+        Output("team-dropdown", "options"),
+    ]
+    inputs = [
+        Input("year-dropdown", "value"),
+        Input("team-dropdown", "value"),
+    ]
+
+    # Details figures, filtered in the browser from the match-data store when enabled
+    if CLIENTSIDE_FILTERING:
+        app.clientside_callback(
+            ClientsideFunction(namespace="worldcup", function_name="update_details_page"),
+            outputs,
+            inputs,
+            State("match-data", "data"),
+        )
+    else:
+        @app.callback(outputs, inputs)
+        @timed("callback")
+        @cached_figures
+        def update_details_page(selected_year, selected_team):
+            # Look up the precomputed aggregates for the year
+            year_stats = aggregate_store.year(selected_year)
+
+            # Get the winning team
+            winning_team = year_stats["winner"]
+
+            # Fall back to the winner when no team has been picked yet
+            team = selected_team if selected_team else winning_team
+            team_stats = aggregate_store.team(selected_year, team) or {
+                "matches": pd.DataFrame({"runs": [], "wickets": []}),
+                "venues": pd.DataFrame({"Venue": [], "Runs": [], "Wickets": []}),
+            }
+
+            # Generate the charts
+            team_performance_chart = plot_team_performance(year_stats["team_totals"])
+            category_summary_chart = plot_match_type_summary(year_stats["category_counts"])
+            runs_vs_wickets_chart = plot_runs_vs_wickets(team_stats["matches"], team)
+            venue_performance_chart = plot_venue_performance(team_stats["venues"], team)
+
+            return (
+                f"Winning Team: {winning_team}",
+                f"Total Matches: {year_stats['total_matches']}",
+                f"Played Matches: {year_stats['played_matches']}",
+                f"Abandoned Matches: {year_stats['abandoned_matches']}",
+                category_summary_chart,
+                team_performance_chart,
+                runs_vs_wickets_chart,
+                venue_performance_chart,
+                year_stats["teams"],
+            )
+
+        def invalidate_details(rows):
+            # Only views of years that received matches are stale; a picked team can be
+            # left over from another year, so every known team is dropped for those years
+            teams = set().union(*(aggregate_store.year(year)["teams"] for year in aggregate_store.years()))
+            for year in rows["world_cup_year"].unique():
+                for team in [None] + sorted(teams):
+                    update_details_page.invalidate(year, team)
+
+        live_ingest.add_listener(invalidate_details)
+
     @app.callback(
-        [
-            Output("winning-team", "children"),
-            Output("total-matches", "children"),
-            Output("played-matches", "children"),
-            Output("abandoned", "children"),
-            Output("match-type-summary-chart", "figure"),
-            Output("team-performance-chart", "figure"),
-            Output("runs-vs-wickets-chart", "figure"),
-            Output("venue-performance-chart", "figure"),
-            Output("team-dropdown", "options"),
-        ],
+        Output("leaderboard-table", "children"),
         [
             Input("year-dropdown", "value"),
             Input("team-dropdown", "value"),
+            Input("leaderboard-metric", "value"),
         ],
     )
-    def update_details_page(selected_year, selected_team):
-        # Filter the dataset by year
-        filtered_data = data[data["world_cup_year"] == selected_year]
-
-        # Get the winning team
-        winning_team = (filtered_data[filtered_data["match_category"] == "Final"]["winning_team"].values[0])
-        
-        played_matches = filtered_data[filtered_data["match_status"] == "played"].shape[0]
-        abandoned_matches = filtered_data[filtered_data["match_status"] == "abandoned"].shape[0]
-        
-        # Total number of matches
-        total_matches = filtered_data.shape[0]
-
-        # Populate the team dropdown with unique teams
-        unique_teams = pd.concat([filtered_data["team_1"], filtered_data["team_2"]]).unique()
-        
-        # Generate the charts
-        team_performance_chart = create_team_performance_chart(filtered_data)
-        category_summary_chart = create_world_cup_match_type_summary_chart(filtered_data)
-        runs_vs_wickets_chart = create_runs_vs_wickets_chart(filtered_data, selected_team, winning_team)
-        venue_performance_chart = create_venue_performance_chart(filtered_data, selected_team, winning_team)
-
-        return (
-            f"Winning Team: {winning_team}",
-            f"Total Matches: {total_matches}",
-            f"Played Matches: {played_matches}",
-            f"Abandoned Matches: {abandoned_matches}",
-            category_summary_chart,
-            team_performance_chart,
-            runs_vs_wickets_chart,
-            venue_performance_chart,
-            unique_teams,
-        )
\ No newline at end of file
+    @timed("callback")
+    def update_leaderboard(selected_year, selected_team, metric):
+        # No team picked means every team in the year
+        rows = player_leaderboards.leaderboard(metric, selected_year, selected_team or None)
+        return create_leaderboard_table(rows, metric)
\ No newline at end of file
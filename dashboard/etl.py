@@ -0,0 +1,262 @@
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATA_PATH, file_digest
+
+INPUT_DIR = "../data/WorldCup_Stats"
+STATE_DIR = "../data/cache/etl"
+
+SCORE_COLUMNS = ["team_1_runs", "team_2_runs", "team_1_wickets", "team_2_wickets"]
+DROP_COLUMNS = ["Unnamed: 0", "Unnamed: 0.1", "date", "commentary_line", "best_batters", "best_bowlers", "result"]
+
+# Country names as they appear in the raw files, mapped to the short codes the dashboard uses
+COUNTRY_CODES = {
+    "australia": "AUS",
+    "bangladesh": "BAN",
+    "pakistan": "PAK",
+    "west indies": "WI",
+    "new zealand": "NZ",
+    "india": "IND",
+    "sri lanka": "SL",
+    "england": "ENG",
+    "south africa": "SA",
+    "zimbabwe": "ZIM",
+    "ireland": "IRE",
+    "kenya": "KENYA",
+    "afghanistan": "AFG",
+    "netherlands": "NED",
+    "scotland": "SCO",
+    "canada": "CAN",
+    "u.a.e": "UAE",
+}
+
+ABANDONED = "match abandoned without a ball bowled"
+_QUOTES = re.compile(r"['\"]")
+_RUNS_SUFFIX = re.compile(r"runs ['\"]")
+_YEAR_FILE = re.compile(r"(\d{4})_Match_Stats\.csv$")
+
+
+def naming_countries(countries):
+    """Map country names to short codes; unknown names are upper-cased."""
+    lower = countries.str.lower()
+    return lower.map(COUNTRY_CODES).fillna(lower.str.upper())
+
+
+def extract_best_performers(column, value_pattern, prefix, value_suffix):
+    """Split a "['Name - value', 'Name - value']" column into name/value columns for the top two.
+
+    Rows without a comma get ``Unknown`` and 0, as in the original notebook.
+    """
+    # Years without any recorded performers load as an all-NaN float column
+    text = column.fillna("").astype(str)
+    has_entries = text.str.contains(",", regex=False)
+    # Rows without two entries get the defaults through the same parsing path
+    entries = text.where(has_entries, "Unknown - 0,Unknown - 0").str.strip("[]").str.split(",")
+
+    performers = {}
+    for position in (1, 2):
+        entry = entries.str[position - 1].str.strip()
+        parts = entry.str.split(" - ", n=1)
+        names = parts.str[0].str.replace(_QUOTES, "", regex=True)
+        values = parts.str[1].str.replace(value_pattern, "", regex=True).str.strip()
+
+        performers[f"{prefix}_{position}"] = names
+        performers[f"{prefix}_{position}{value_suffix}"] = pd.to_numeric(values).astype("int64")
+    return pd.DataFrame(performers, index=column.index)
+
+
+def clean_year(raw):
+    """Apply the notebook's cleaning steps to one year's raw match stats."""
+    data = raw.copy()
+    result = data["result"]
+
+    # Matches abandoned without a ball bowled score zero
+    abandoned = result.str.contains(ABANDONED, case=False, regex=False, na=False)
+    data.loc[abandoned, SCORE_COLUMNS] = 0
+
+    # Drop incomplete matches that were not abandoned
+    incomplete = data["team_2_runs"].isna() & ~result.str.contains("abandoned", case=False, regex=False, na=False)
+    data = data[~incomplete].copy()
+    result = data["result"].fillna("").str.lower()
+
+    data["match_status"] = np.where(result.str.contains(ABANDONED, regex=False), "abandoned", "played")
+
+    # Text before "won", minus any "... - " or "(" prefixes
+    winners = result.str.split("won", n=1).str[0].str.strip().where(result.str.contains("won", regex=False), "")
+    winners = winners.str.split("-").str[-1].str.strip().str.split("(").str[-1].str.strip()
+    data["winning_team"] = winners
+
+    batters = extract_best_performers(data["best_batters"], _RUNS_SUFFIX, "best_batter", "_runs")
+    ballers = extract_best_performers(data["best_bowlers"], _QUOTES, "best_baller", "_wick")
+    data = pd.concat([data, batters, ballers], axis=1)
+
+    data = data.drop(columns=[column for column in DROP_COLUMNS if column in data])
+
+    for column in ["team_1", "team_2", "host_country", "winning_team"]:
+        data[column] = naming_countries(data[column])
+
+    data["pom"] = data["pom"].fillna("Unknown")
+    data["winning_team"] = data["winning_team"].replace("", "Unknown")
+    return data
+
+
+def year_files(input_dir=INPUT_DIR):
+    """Year stat files in tournament order."""
+    return sorted(path for path in glob.glob(os.path.join(input_dir, "*.csv")) if _YEAR_FILE.search(path))
+
+
+def _load_manifest(state_dir):
+    try:
+        with open(os.path.join(state_dir, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}, "output": None}
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _save_manifest(state_dir, manifest):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    _atomic_write(os.path.join(state_dir, "manifest.json"), write)
+
+
+def _cleaned_path(state_dir, path):
+    return os.path.join(state_dir, os.path.splitext(os.path.basename(path))[0] + ".pkl")
+
+
+def process_file(path):
+    """Read and clean one year file; returns the cleaned frame and the raw row count."""
+    raw = pd.read_csv(path)
+    return clean_year(raw), len(raw)
+
+
+def _timed_process_file(path):
+    start = time.perf_counter()
+    cleaned, raw_rows = process_file(path)
+    return cleaned, raw_rows, time.perf_counter() - start
+
+
+def process_files(paths, workers=1):
+    """Clean several year files, in worker processes when ``workers`` > 1.
+
+    Returns ``{path: (cleaned, raw_rows, seconds)}``; callers merge in their own
+    order, so the result does not depend on which worker finishes first.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        return {path: _timed_process_file(path) for path in paths}
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        return dict(zip(paths, executor.map(_timed_process_file, paths)))
+
+
+def combine(parts):
+    """Concatenate cleaned year frames in order, numbering rows by their raw position like the notebook."""
+    frames = []
+    offset = 0
+    for cleaned, raw_rows in parts:
+        frames.append(cleaned.set_axis(cleaned.index + offset))
+        offset += raw_rows
+    combined = pd.concat(frames) if frames else pd.DataFrame()
+    return combined.drop_duplicates()
+
+
+def run(input_dir=INPUT_DIR, output=DATA_PATH, state_dir=STATE_DIR, force=False, workers=1):
+    """Rebuild the cleaned dataset, reprocessing only year files whose content changed."""
+    start = time.perf_counter()
+    manifest = _load_manifest(state_dir)
+    previous = manifest["files"]
+    paths = year_files(input_dir)
+
+    # Work out which files changed before fanning the parsing out
+    digests = {}
+    stale = []
+    for path in paths:
+        name = os.path.basename(path)
+        digests[path] = file_digest(path)
+        entry = previous.get(name)
+        if force or not entry or entry["digest"] != digests[path] or not os.path.exists(_cleaned_path(state_dir, path)):
+            stale.append(path)
+
+    results = process_files(stale, workers)
+
+    files = {}
+    parts = []
+    timings = {}
+    for path in paths:
+        name = os.path.basename(path)
+        cleaned_path = _cleaned_path(state_dir, path)
+        if path in results:
+            cleaned, raw_rows, seconds = results[path]
+            _atomic_write(cleaned_path, cleaned.to_pickle)
+            timings[name] = seconds
+        else:
+            cleaned = pd.read_pickle(cleaned_path)
+            raw_rows = previous[name]["rows"]
+
+        files[name] = {"digest": digests[path], "rows": raw_rows}
+        parts.append((cleaned, raw_rows))
+
+    processed = list(timings)
+    summary = {
+        "processed": processed,
+        "timings": timings,
+        "raw_rows": sum(files[name]["rows"] for name in processed),
+        "workers": workers,
+    }
+
+    # Nothing changed and the output is still ours: leave it alone
+    unchanged = not processed and files.keys() == previous.keys()
+    if unchanged and not force and os.path.exists(output) and manifest.get("output") == file_digest(output):
+        return dict(summary, rows=None, written=False, seconds=time.perf_counter() - start)
+
+    combined = combine(parts)
+    _atomic_write(output, combined.to_csv)
+
+    manifest = {"files": files, "output": file_digest(output)}
+    _save_manifest(state_dir, manifest)
+    return dict(summary, rows=len(combined), written=True, seconds=time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build crick_df_cleaned.csv from the per-year WorldCup_Stats files.")
+    parser.add_argument("--input-dir", default=INPUT_DIR)
+    parser.add_argument("--output", default=DATA_PATH)
+    parser.add_argument("--state-dir", default=STATE_DIR, help="where per-file hashes and cleaned frames are kept")
+    parser.add_argument("--force", action="store_true", help="reprocess every file")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for parsing (0 = one per CPU)")
+    parser.add_argument("--timings", action="store_true", help="print how long each processed file took")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    summary = run(args.input_dir, args.output, args.state_dir, args.force, workers)
+    if args.timings:
+        for name, seconds in summary["timings"].items():
+            print(f"{name}: {seconds * 1000:.1f} ms")
+    if summary["written"]:
+        print(
+            f"processed {len(summary['processed'])} file(s) {summary['processed']}, "
+            f"wrote {summary['rows']} rows to {args.output} in {summary['seconds'] * 1000:.1f} ms"
+        )
+    else:
+        print(f"up to date ({summary['seconds'] * 1000:.1f} ms)")
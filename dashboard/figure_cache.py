@@ -0,0 +1,171 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from plotly.utils import PlotlyJSONEncoder
+
+from dataset import dataset_version
+from metrics import metrics
+
+# In-process entries kept, and an optional directory shared by all server workers
+CACHE_SIZE = int(os.environ.get("FIGURE_CACHE_SIZE", "256"))
+CACHE_DIR = os.environ.get("FIGURE_CACHE_DIR")
+
+
+class FigureCache:
+    """Serialized callback outputs keyed by callback name, inputs and dataset version.
+
+    Entries live in an in-process LRU and, when ``directory`` is set, in JSON
+    files there so several gunicorn workers can share the work. ``version`` is
+    called on every lookup: once it differs from the version at creation, e.g.
+    after a live append to this process's table, the shared files describe
+    another table and are no longer read or written.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE, directory=CACHE_DIR, version=lambda: ""):
+        self.maxsize = maxsize
+        self.directory = directory
+        self._current_version = version
+        self.version = version()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, name, args):
+        payload = json.dumps([name, self.version, args], cls=PlotlyJSONEncoder, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the serialized value for a key, or None."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def discard(self, key):
+        """Drop one entry from memory and disk, e.g. after the data behind it changed."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._shared():
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "directory": self.directory if self._shared() else None,
+                "version": self._current_version(),
+            }
+
+    def _shared(self):
+        return bool(self.directory) and self._current_version() == self.version
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self._shared():
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, value):
+        if not self._shared():
+            return
+        # Write to a temp file and rename so other workers never see partial JSON
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+# Shared cache for the dashboard process, versioned by the dataset contents
+figure_cache = FigureCache(version=dataset_version)
+
+
+def _collect_gauges():
+    stats = figure_cache.stats()
+    return [
+        ("dashboard_figure_cache_lookups", "Figure cache lookups.", {"result": "hit"}, stats["hits"]),
+        ("dashboard_figure_cache_lookups", "Figure cache lookups.", {"result": "disk_hit"}, stats["disk_hits"]),
+        ("dashboard_figure_cache_lookups", "Figure cache lookups.", {"result": "miss"}, stats["misses"]),
+        ("dashboard_figure_cache_entries", "Entries in the in-process figure cache.", {}, stats["size"]),
+    ]
+
+
+metrics.add_collector(_collect_gauges)
+
+
+def cached_figures(func=None, *, cache=figure_cache):
+    """Memoize a figure-producing function on its arguments and the dataset version.
+
+    The result is stored as Plotly JSON and returned decoded, which Dash accepts
+    in place of figure objects. ``wrapper.invalidate(*args)`` drops the entry for
+    one set of arguments.
+    """
+    if func is None:
+        return functools.partial(cached_figures, cache=cache)
+
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = cache.make_key(name, list(args))
+        value = cache.get(key)
+        if value is None:
+            value = json.dumps(func(*args), cls=PlotlyJSONEncoder)
+            cache.set(key, value)
+        return json.loads(value)
+
+    def invalidate(*args):
+        cache.discard(cache.make_key(name, list(args)))
+
+    wrapper.invalidate = invalidate
+    return wrapper
@@ -0,0 +1,93 @@
+import functools
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Scatter plots with more points than this render with WebGL (scattergl) instead of SVG
+SCATTERGL_THRESHOLD = int(os.environ.get("SCATTERGL_THRESHOLD", "1000"))
+# Decimal places kept in figure data arrays
+FIGURE_DIGITS = 2
+
+# Trace types the dashboard draws, and the template layout keys that style them
+TEMPLATE_TRACES = ("bar", "pie", "scatter", "scattergl")
+TEMPLATE_LAYOUT = (
+    "autotypenumbers", "colorway", "font", "hoverlabel", "hovermode",
+    "paper_bgcolor", "plot_bgcolor", "title", "xaxis", "yaxis",
+)
+DATA_ARRAYS = ("x", "y", "values")
+
+
+def _trimmed(template):
+    return {
+        "data": {name: template["data"][name] for name in TEMPLATE_TRACES if name in template["data"]},
+        "layout": {name: template["layout"][name] for name in TEMPLATE_LAYOUT if name in template["layout"]},
+    }
+
+
+# The default template without the defaults for trace types and subplots the dashboard
+# never draws. The full one is about 7.5 KB, went out with every figure and made each
+# Plotly Express call slower; this one renders the bar, pie and scatter charts the same.
+if pio.templates.default != "dashboard":
+    pio.templates["dashboard"] = go.layout.Template(_trimmed(pio.templates[pio.templates.default].to_plotly_json()))
+    pio.templates.default = "dashboard"
+
+
+def slim_template():
+    """The dashboard template as JSON, for figures built outside Plotly such as clientside.js."""
+    return pio.templates["dashboard"].to_plotly_json()
+
+
+def render_mode(points):
+    """Plotly Express render_mode for a scatter plot of the given number of points."""
+    return "webgl" if points > SCATTERGL_THRESHOLD else "svg"
+
+
+def _rounded(values, digits):
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in "fiu":
+        return values
+    # Whole numbers go out as JSON integers, which are shorter than floats
+    if values.dtype.kind == "f" and np.all(np.mod(values, 1) == 0):
+        return values.astype(np.int64)
+    return np.round(values, digits) if values.dtype.kind == "f" else values
+
+
+def slim_figure(fig, digits=FIGURE_DIGITS):
+    """Shrink a Plotly Express figure's JSON without changing how it renders.
+
+    Rounds the data arrays and unsets trace and axis attributes that only repeat
+    Plotly's defaults; the template is already the slim one set as default above.
+    """
+    for trace in fig.data:
+        for name in DATA_ARRAYS:
+            if name in trace:
+                trace[name] = _rounded(trace[name], digits)
+        for name, default in (("xaxis", "x"), ("yaxis", "y"), ("legendgroup", ""), ("showlegend", True)):
+            if name in trace and trace[name] == default:
+                trace[name] = None
+        if trace.type == "bar" and trace.marker.pattern.shape == "":
+            trace.marker.pattern = None
+        if trace.type == "pie" and trace.domain.x == (0, 1) and trace.domain.y == (0, 1):
+            trace.domain = None
+    for axis, anchor in (("xaxis", "y"), ("yaxis", "x")):
+        if fig.layout[axis].anchor == anchor and fig.layout[axis].domain == (0, 1):
+            fig.layout[axis].anchor = None
+            fig.layout[axis].domain = None
+    return fig
+
+
+def slimmed(func):
+    """Decorator slimming the figure, or each figure of a tuple, a builder returns.
+
+    Figure sizes are recorded per callback output by the response hook in metrics.py.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        figures = result if isinstance(result, tuple) else (result,)
+        for fig in figures:
+            slim_figure(fig)
+        return result
+
+    return wrapper
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+from precomputed import Precomputed
+
+
+def pair_key(team1, team2):
+    """Unordered key for a pair of teams."""
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+
+SUMMED = ["matches", "first_wins", "second_wins", "first_runs", "second_runs", "first_wickets", "second_wickets"]
+
+
+def _summary(totals, first, second):
+    return {
+        "matches": int(totals.matches),
+        "wins": {first: int(totals.first_wins), second: int(totals.second_wins)},
+        "no_result": int(totals.matches - totals.first_wins - totals.second_wins),
+        "runs": {first: float(totals.first_runs), second: float(totals.second_runs)},
+        "wickets": {first: float(totals.first_wickets), second: float(totals.second_wickets)},
+    }
+
+
+def _oriented(data):
+    """One row per match, oriented as (first, second) with first <= second."""
+    team_1 = data["team_1"].astype(str).to_numpy()
+    team_2 = data["team_2"].astype(str).to_numpy()
+    winners = data["winning_team"].astype(str).to_numpy()
+    swap = team_1 > team_2
+    first = np.where(swap, team_2, team_1)
+    second = np.where(swap, team_1, team_2)
+
+    return pd.DataFrame({
+        "first": first,
+        "second": second,
+        "world_cup_year": data["world_cup_year"].to_numpy(),
+        "matches": 1,
+        "first_wins": winners == first,
+        "second_wins": winners == second,
+        "first_runs": np.where(swap, data["team_2_runs"], data["team_1_runs"]),
+        "second_runs": np.where(swap, data["team_1_runs"], data["team_2_runs"]),
+        "first_wickets": np.where(swap, data["team_2_wickets"], data["team_1_wickets"]),
+        "second_wickets": np.where(swap, data["team_1_wickets"], data["team_2_wickets"]),
+    })
+
+
+def _add(summary, match, first, second):
+    """Fold one oriented match into a summary made by _summary."""
+    summary["matches"] += int(match.matches)
+    summary["wins"][first] += int(match.first_wins)
+    summary["wins"][second] += int(match.second_wins)
+    summary["no_result"] = summary["matches"] - summary["wins"][first] - summary["wins"][second]
+    summary["runs"][first] += float(match.first_runs)
+    summary["runs"][second] += float(match.second_runs)
+    summary["wickets"][first] += float(match.first_wickets)
+    summary["wickets"][second] += float(match.second_wickets)
+
+
+class HeadToHeadIndex(Precomputed):
+    """Per-pair match counts, wins, runs and wickets, all-time and per year."""
+
+    incremental = True
+
+    def _build(self, data):
+        matches = _oriented(data)
+
+        # One grouped sum per (pair, year); all-time totals are sums of those
+        yearly = matches.groupby(["first", "second", "world_cup_year"], sort=True)[SUMMED].sum()
+        all_time = yearly.groupby(level=["first", "second"], sort=True).sum()
+        rows = matches.groupby(["first", "second"], sort=True).indices
+
+        pairs = {}
+        for totals in all_time.itertuples():
+            pair = totals.Index
+            pairs[pair] = {
+                "all_time": _summary(totals, *pair),
+                "years": {},
+                # Positions of the pair's matches in the match table
+                "rows": rows[pair],
+            }
+        for totals in yearly.itertuples():
+            first_team, second_team, year = totals.Index
+            pairs[(first_team, second_team)]["years"][year] = _summary(totals, first_team, second_team)
+        self._pairs = pairs
+
+    def _append(self, rows):
+        new_pairs = False
+        for position, match in zip(rows.index, _oriented(rows).itertuples(index=False)):
+            pair = (match.first, match.second)
+            record = self._pairs.get(pair)
+            if record is None:
+                new_pairs = True
+                record = self._pairs[pair] = {"all_time": _summary(match, *pair), "years": {}, "rows": np.array([position])}
+            else:
+                _add(record["all_time"], match, *pair)
+                record["rows"] = np.append(record["rows"], position)
+
+            years = record["years"]
+            if match.world_cup_year in years:
+                _add(years[match.world_cup_year], match, *pair)
+            else:
+                years[match.world_cup_year] = _summary(match, *pair)
+                record["years"] = dict(sorted(years.items()))
+
+        if new_pairs:
+            self._pairs = dict(sorted(self._pairs.items()))
+
+    def matchup(self, team1, team2):
+        """Head-to-head record for two teams, or None if they never met."""
+        self.ensure_built()
+        return self._pairs.get(pair_key(team1, team2))
+
+    def pairs(self):
+        self.ensure_built()
+        return list(self._pairs)
+
+
+def format_matchup(record, team1, team2):
+    """One-line summary of a head-to-head record from team1's point of view."""
+    if team1 == team2:
+        return "Pick two different teams to compare."
+    if record is None:
+        return f"{team1} and {team2} have not met in a World Cup."
+    all_time = record["all_time"]
+    return (
+        f"{team1} vs {team2}: {all_time['matches']} matches, "
+        f"{team1} won {all_time['wins'][team1]}, {team2} won {all_time['wins'][team2]}, "
+        f"{all_time['no_result']} without a result. "
+        f"Runs {all_time['runs'][team1]:.0f} - {all_time['runs'][team2]:.0f}, "
+        f"wickets lost {all_time['wickets'][team1]:.0f} - {all_time['wickets'][team2]:.0f} "
+        f"across {len(record['years'])} tournaments."
+    )
@@ -0,0 +1,90 @@
+import json
+import os
+
+# Which CPU inference backend to serve the models with
+BACKEND = os.environ.get("INFERENCE_BACKEND", "pipeline")
+ONNX_DIR = "../models/onnx"
+
+
+def load_pipeline(path):
+    """The joblib-pickled transformers pipeline, unchanged."""
+    # joblib pulls in torch and transformers while unpickling, so import on first use
+    from joblib import load
+
+    return load(path)
+
+
+def load_quantized(path):
+    """The pickled pipeline with its Linear layers dynamically quantized to int8."""
+    import torch
+
+    pipeline = load_pipeline(path)
+    pipeline.model = torch.quantization.quantize_dynamic(pipeline.model, {torch.nn.Linear}, dtype=torch.qint8)
+    pipeline.model.eval()
+    return pipeline
+
+
+# Written last into each export, so an interrupted export is redone on the next load
+ONNX_METADATA = "pipeline.json"
+
+
+def load_onnx(path, export_dir=ONNX_DIR):
+    """The pickled pipeline re-served through ONNX Runtime, exporting the model on first use.
+
+    Once exported, only the ONNX model, its tokenizer and the pipeline settings are
+    loaded; the pickled torch pipeline is read only to build the export.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTModelForTokenClassification
+    except ImportError as exc:
+        raise ImportError("The onnx backend needs `pip install optimum[onnxruntime]`") from exc
+    from transformers import AutoTokenizer
+    from transformers import pipeline as make_pipeline
+
+    model_classes = {
+        "sentiment-analysis": ORTModelForSequenceClassification,
+        "text-classification": ORTModelForSequenceClassification,
+        "ner": ORTModelForTokenClassification,
+        "token-classification": ORTModelForTokenClassification,
+    }
+    target = os.path.join(export_dir, os.path.splitext(os.path.basename(path))[0])
+    metadata_path = os.path.join(target, ONNX_METADATA)
+
+    if os.path.exists(metadata_path):
+        with open(metadata_path, encoding="utf-8") as f:
+            metadata = json.load(f)
+        model = model_classes[metadata["task"]].from_pretrained(target)
+        tokenizer = AutoTokenizer.from_pretrained(target)
+    else:
+        # Export from the pickled weights so both backends serve the same model
+        source = load_pipeline(path)
+        source_dir = os.path.join(target, "source")
+        source.save_pretrained(source_dir)
+        model = model_classes[source.task].from_pretrained(source_dir, export=True)
+        model.save_pretrained(target)
+        tokenizer = source.tokenizer
+        tokenizer.save_pretrained(target)
+        metadata = {"task": source.task}
+        if source.task in ("ner", "token-classification"):
+            metadata["aggregation_strategy"] = source._postprocess_params.get("aggregation_strategy", "none")
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+    kwargs = {}
+    if "aggregation_strategy" in metadata:
+        kwargs["aggregation_strategy"] = metadata["aggregation_strategy"]
+    return make_pipeline(metadata["task"], model=model, tokenizer=tokenizer, **kwargs)
+
+
+BACKENDS = {
+    "pipeline": load_pipeline,
+    "quantized": load_quantized,
+    "onnx": load_onnx,
+}
+
+
+def load_model(path, backend=BACKEND):
+    """Load a pickled pipeline with the given backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend](path)
@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import metrics
+from model_registry import registry
+from result_cache import normalize_text, prediction_cache
+from sentiment_prediction import describe_sentiment
+
+# Batching window, overridable from the environment
+MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", "8"))
+MAX_WAIT_MS = float(os.environ.get("INFERENCE_MAX_WAIT_MS", "20"))
+
+
+class BatchInferenceService:
+    """Collect sentiment requests from many callers and run them through the models in batches."""
+
+    def __init__(self, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, models=registry, cache=prediction_cache):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self._models = models
+        self._cache = cache
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._batch_sizes = {}
+
+    def start(self):
+        """Start the worker thread if it is not already running."""
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="batch-inference", daemon=True)
+                self._worker.start()
+
+    def submit(self, text, target_entity):
+        """Queue a request and return a Future resolving to the prediction message."""
+        future = Future()
+        text = normalize_text(text)
+
+        # Answer repeated requests without touching the queue
+        cached = self._cache.get((text, target_entity))
+        if cached is not None:
+            future.set_result(cached)
+            return future
+
+        self.start()
+        self._queue.put((text, target_entity, future))
+        return future
+
+    def predict(self, text, target_entity, timeout=None):
+        """Queue a request and block until its own result is ready."""
+        return self.submit(text, target_entity).result(timeout=timeout)
+
+    def metrics(self):
+        """Return queue depth and batch size statistics."""
+        with self._metrics_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": self._items / self._batches if self._batches else 0.0,
+                "largest_batch": self._largest_batch,
+                "batch_size_counts": dict(self._batch_sizes),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "cache": self._cache.stats(),
+            }
+
+    def _collect(self):
+        # Block for the first request, then wait up to the window for more
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self._infer([text for text, _, _ in batch], [entity for _, entity, _ in batch])
+            except Exception as exc:
+                for _, _, future in batch:
+                    future.set_exception(exc)
+            else:
+                for (text, entity, future), result in zip(batch, results):
+                    self._cache.set((text, entity), result)
+                    future.set_result(result)
+            self._record(len(batch))
+
+    def _infer(self, texts, target_entities):
+        ner_model = self._models.get("ner")
+
+        # One NER forward pass for the whole batch
+        start = time.perf_counter()
+        entity_batches = ner_model(texts, batch_size=len(texts))
+        metrics.observe("ner", "model", time.perf_counter() - start)
+        entity_names = [[e["word"] for e in entities] for entities in entity_batches]
+
+        # Only texts that mention their entity need the sentiment model
+        pending = [i for i, entity in enumerate(target_entities) if entity in entity_names[i]]
+        sentiments = [None] * len(texts)
+        if pending:
+            sentiment_model = self._models.get("sentiment")
+            start = time.perf_counter()
+            outputs = sentiment_model([texts[i] for i in pending], batch_size=len(pending))
+            metrics.observe("sentiment", "model", time.perf_counter() - start)
+            for i, output in zip(pending, outputs):
+                sentiments[i] = output["label"]
+
+        return [
+            describe_sentiment(text, entity, names, sentiment)
+            for text, entity, names, sentiment in zip(texts, target_entities, entity_names, sentiments)
+        ]
+
+    def _record(self, size):
+        with self._metrics_lock:
+            self._batches += 1
+            self._items += size
+            self._largest_batch = max(self._largest_batch, size)
+            self._batch_sizes[size] = self._batch_sizes.get(size, 0) + 1
+
+
+# Shared service for the dashboard process
+inference_service = BatchInferenceService()
+
+
+def _collect_gauges():
+    stats = inference_service.metrics()
+    cache = stats["cache"]
+    return [
+        ("dashboard_inference_queue_depth", "Sentiment requests waiting for a batch.", {}, stats["queue_depth"]),
+        ("dashboard_inference_batches", "Batches run by the inference worker.", {}, stats["batches"]),
+        ("dashboard_inference_items", "Requests run by the inference worker.", {}, stats["items"]),
+        ("dashboard_inference_mean_batch_size", "Mean requests per batch.", {}, stats["mean_batch_size"]),
+        ("dashboard_prediction_cache_lookups", "Prediction cache lookups.", {"result": "hit"}, cache["hits"]),
+        ("dashboard_prediction_cache_lookups", "Prediction cache lookups.", {"result": "miss"}, cache["misses"]),
+        ("dashboard_prediction_cache_entries", "Entries in the prediction cache.", {}, cache["size"]),
+    ]
+
+
+metrics.add_collector(_collect_gauges)
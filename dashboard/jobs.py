@@ -0,0 +1,63 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+from metrics import metrics
+
+MAX_JOBS = 1024
+
+
+class JobManager:
+    """Hand out ids for in-flight Futures so the browser can poll or cancel them."""
+
+    def __init__(self, max_jobs=MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def track(self, future):
+        """Register a Future and return its job id."""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = future
+            # Forget the oldest jobs nobody came back for
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        return job_id
+
+    def status(self, job_id):
+        """Return (state, result) where state is pending, done, failed, cancelled or unknown.
+
+        Finished jobs are forgotten once their status has been read.
+        """
+        with self._lock:
+            future = self._jobs.get(job_id)
+            if future is None:
+                return "unknown", None
+            if not future.done():
+                return "pending", None
+            del self._jobs[job_id]
+
+        if future.cancelled():
+            return "cancelled", None
+        if future.exception() is not None:
+            return "failed", future.exception()
+        return "done", future.result()
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started running yet; returns True if it was cancelled."""
+        with self._lock:
+            future = self._jobs.pop(job_id, None)
+        return future is not None and future.cancel()
+
+    def pending(self):
+        with self._lock:
+            return sum(not future.done() for future in self._jobs.values())
+
+
+# Sentiment predictions started from the main page
+prediction_jobs = JobManager()
+
+metrics.add_collector(lambda: [
+    ("dashboard_prediction_jobs_pending", "Sentiment jobs still waiting or running.", {}, prediction_jobs.pending()),
+])
@@ -0,0 +1,252 @@
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+from flask import abort, jsonify, request
+
+from dataset import append_matches
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# LIVE_DROP_DIR=<dir> appends every *.json match record dropped into that directory
+DROP_DIR = os.environ.get("LIVE_DROP_DIR")
+DROP_INTERVAL = float(os.environ.get("LIVE_DROP_INTERVAL", "2"))
+# POST /api/matches only answers localhost unless LIVE_ALLOW_REMOTE=1
+ALLOW_REMOTE = os.environ.get("LIVE_ALLOW_REMOTE") == "1"
+
+# Columns of crick_df_cleaned.csv after its id column, in file order
+MATCH_COLUMNS = [
+    "venue", "match_category", "team_1", "team_2", "team_1_runs", "team_1_wickets", "team_2_runs",
+    "team_2_wickets", "pom", "world_cup_year", "host_country", "match_status", "winning_team",
+    "best_batter_1", "best_batter_1_runs", "best_batter_2", "best_batter_2_runs",
+    "best_baller_1", "best_baller_1_wick", "best_baller_2", "best_baller_2_wick",
+]
+CATEGORIES = ["League-Match", "Semi-Final", "Final"]
+STATUSES = ["played", "abandoned"]
+TEAM_CODE = re.compile(r"^[A-Z]{2,6}$")
+# Optional fields and the value the cleaned table uses when they are unknown
+DEFAULTS = {
+    "pom": "Unknown",
+    "best_batter_1": "Unknown", "best_batter_1_runs": 0,
+    "best_batter_2": "Unknown", "best_batter_2_runs": 0,
+    "best_baller_1": "Unknown", "best_baller_1_wick": 0,
+    "best_baller_2": "Unknown", "best_baller_2_wick": 0,
+}
+
+
+def _text(record, field, errors):
+    value = record.get(field)
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"{field} must be a non-empty string")
+        return None
+    return value.strip()
+
+
+def _number(record, field, errors, low, high, default=None):
+    value = record.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+        errors.append(f"{field} must be a number between {low} and {high}")
+        return None
+    return value
+
+
+def validate_match(record):
+    """Check a match record and return it as a full row of the cleaned table.
+
+    Raises ValueError listing every problem found.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("a match record must be a JSON object")
+    errors = []
+    row = {}
+
+    # Venues in the cleaned table keep the space left over from the scraped "at <venue>" text
+    venue = _text(record, "venue", errors)
+    row["venue"] = f" {venue}" if venue else None
+    row["host_country"] = _text(record, "host_country", errors)
+
+    for field in ("team_1", "team_2"):
+        row[field] = _text(record, field, errors)
+        if row[field] and not TEAM_CODE.match(row[field]):
+            errors.append(f"{field} must be a team code such as AUS or IND")
+    if row["team_1"] and row["team_1"] == row["team_2"]:
+        errors.append("team_1 and team_2 must be different teams")
+
+    row["match_category"] = record.get("match_category")
+    if row["match_category"] not in CATEGORIES:
+        errors.append(f"match_category must be one of {', '.join(CATEGORIES)}")
+    row["match_status"] = record.get("match_status")
+    if row["match_status"] not in STATUSES:
+        errors.append(f"match_status must be one of {', '.join(STATUSES)}")
+
+    year = _number(record, "world_cup_year", errors, 1975, 2100)
+    if year is not None and year != int(year):
+        errors.append("world_cup_year must be a whole year")
+    row["world_cup_year"] = int(year) if year is not None else None
+
+    # Abandoned matches are stored with zero scores and no winner
+    played = row["match_status"] == "played"
+    default = None if played else 0
+    for side in ("team_1", "team_2"):
+        runs = _number(record, f"{side}_runs", errors, 0, 1000, default)
+        wickets = _number(record, f"{side}_wickets", errors, 0, 10, default)
+        row[f"{side}_runs"] = float(runs) if runs is not None else None
+        row[f"{side}_wickets"] = float(wickets) if wickets is not None else None
+
+    winner = record.get("winning_team", None if played else "Unknown")
+    if played and winner not in (row["team_1"], row["team_2"], "Unknown"):
+        errors.append("winning_team must be team_1, team_2 or Unknown")
+    if not played and winner != "Unknown":
+        errors.append("an abandoned match has no winning_team")
+    row["winning_team"] = winner
+
+    for field, default in DEFAULTS.items():
+        if isinstance(default, str):
+            value = record.get(field, default)
+            if not isinstance(value, str):
+                errors.append(f"{field} must be a string")
+            row[field] = value
+        else:
+            value = _number(record, field, errors, 0, 1000, default)
+            row[field] = int(value) if value is not None else None
+
+    unknown = sorted(set(record) - set(MATCH_COLUMNS))
+    if unknown:
+        errors.append(f"unknown fields: {', '.join(unknown)}")
+    if errors:
+        raise ValueError("; ".join(errors))
+    return row
+
+
+class LiveIngest:
+    """Validates live match records, appends them to the dataset and notifies listeners.
+
+    Listeners are called in registration order with the appended rows, indexed by
+    their positions in the table, so derived structures can update in place and
+    caches can drop only the entries the new matches affect. A listener that
+    raises is logged and counted on /metrics; the others still run.
+    """
+
+    def __init__(self, append_rows=append_matches):
+        self._append_rows = append_rows
+        self._listeners = []
+        self._lock = threading.Lock()
+        # Drop-folder files already appended but not moved out of the folder
+        self._ingested = set()
+        self.appended = 0
+        self.last_seconds = None
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def append(self, records, on_appended=None):
+        """Append one record or a list of records; returns a summary of the append.
+
+        ``on_appended()`` runs once the rows are in the CSV, before the listeners.
+        """
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list) or not records:
+            raise ValueError("expected a match record or a non-empty list of them")
+        rows = pd.DataFrame([validate_match(record) for record in records], columns=MATCH_COLUMNS)
+
+        with self._lock:
+            start = time.perf_counter()
+            rows = self._append_rows(rows)
+            if on_appended is not None:
+                on_appended()
+            for listener in self._listeners:
+                try:
+                    listener(rows)
+                except Exception:
+                    name = getattr(listener, "__qualname__", repr(listener))
+                    logger.exception("live append listener %s failed", name)
+                    metrics.error(name, "ingest")
+            seconds = time.perf_counter() - start
+            self.appended += len(rows)
+            self.last_seconds = seconds
+        metrics.observe("append_matches", "ingest", seconds)
+        return {"appended": len(rows), "positions": rows.index.tolist(), "seconds": seconds}
+
+    def watch(self, directory, interval=DROP_INTERVAL):
+        """Poll a drop folder in a daemon thread, appending each *.json file once.
+
+        Appended files move to ``processed/`` as soon as they are in the CSV, and
+        files that could not be appended to ``rejected/`` next to a ``.error``
+        file saying why.
+        """
+        for name in ("processed", "rejected"):
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+
+        def poll():
+            while True:
+                for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+                    try:
+                        self._ingest_file(directory, path)
+                    except Exception:
+                        logger.exception("live drop folder: failed on %s", path)
+                time.sleep(interval)
+
+        thread = threading.Thread(target=poll, name="live-drop-folder", daemon=True)
+        thread.start()
+        return thread
+
+    def _ingest_file(self, directory, path):
+        name = os.path.basename(path)
+        if path in self._ingested:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            # Already gone or not readable yet; try again on the next poll
+            return
+
+        appended = []
+
+        def mark_processed():
+            # Moved before the listeners run, so a failure after this point can never append the file twice
+            appended.append(path)
+            try:
+                os.replace(path, os.path.join(directory, "processed", name))
+            except OSError:
+                logger.exception("live drop folder: could not move %s to processed/", path)
+                self._ingested.add(path)
+
+        try:
+            self.append(json.loads(text), on_appended=mark_processed)
+        except Exception as error:
+            if appended:
+                raise
+            if not isinstance(error, ValueError):
+                logger.exception("live drop folder: could not append %s", path)
+            with open(os.path.join(directory, "rejected", name + ".error"), "w", encoding="utf-8") as f:
+                f.write(f"{error}\n")
+            os.replace(path, os.path.join(directory, "rejected", name))
+
+
+# Shared ingest for the dashboard process; the pages register their listeners on import
+live_ingest = LiveIngest()
+
+
+def register_live_routes(server, ingest=live_ingest):
+    """Accept new matches with POST /api/matches, from localhost unless LIVE_ALLOW_REMOTE=1."""
+    @server.route("/api/matches", methods=["POST"])
+    def append_live_matches():
+        if not ALLOW_REMOTE and request.remote_addr not in ("127.0.0.1", "::1"):
+            abort(403)
+        try:
+            summary = ingest.append(request.get_json(force=True, silent=True))
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+        return jsonify(summary), 201
+
+    metrics.add_collector(lambda: [
+        ("dashboard_live_matches_appended", "Matches appended since the process started.", {}, ingest.appended),
+    ])
@@ -1,16 +1,29 @@
-from dash import html, dcc, Input, Output, State
+from dash import html, dcc, Input, Output, State, ClientsideFunction
 import plotly.express as px
 import pandas as pd
 import dash
 
-from sentiment_prediction import entity_sentiment_analysis
+from inference_service import inference_service
+from jobs import prediction_jobs
 from map_team import get_team_name
+from figure_cache import cached_figures
+from metrics import timed
+from figures import slimmed
+from dataset import get_matches
+from head_to_head import HeadToHeadIndex, format_matchup
+from team_sentiment import INDEX_PATH, TeamSentimentIndex, format_team_sentiment
+from client_data import CLIENTSIDE_FILTERING
+from live import live_ingest
 
-# Load the dataset
-data = pd.read_csv("../data/crick_df_cleaned.csv")
+# Extract unique team names from the shared dataset
+matches = get_matches()
+unique_teams = sorted(pd.concat([matches["team_1"], matches["team_2"]]).unique())
 
-# Extract unique team names
-unique_teams = sorted(pd.concat([data["team_1"], data["team_2"]]).unique())
+# Head-to-head records for every pair of teams, built on first use
+head_to_head_index = HeadToHeadIndex(matches, lazy=True)
+
+# Commentary sentiment per team, read from the offline index on first use
+team_sentiment_index = TeamSentimentIndex(INDEX_PATH, lazy=True)
 
 def get_main_page_layout():
     """Return the layout for the Main Page."""
@@ -59,6 +72,9 @@ def get_main_page_layout():
                         ),
                     ], style={"width": "30%", "display": "inline-block", "margin-right": "10px"}),
                 ], style={"display": "flex", "flexDirection": "row", "justifyContent": "space-between", "margin": "35px"}),
+
+                html.Div(id="head-to-head-summary", style={"margin": "0 35px", "fontSize": "13px"}),
+                html.Div(id="team-sentiment-summary", style={"margin": "10px 35px 0", "fontSize": "13px"}),
                 
                 html.Div([
                     html.Div([
@@ -77,7 +93,18 @@ def get_main_page_layout():
                         n_clicks=0,
                         style={"margin-left": "20px", "padding": "10px", "border": "1px solid black", "border-radius": "10px", "width": "20%", "fontSize": "10px"},
                     ),
+                    html.Button(
+                        "Cancel",
+                        id="cancel-button",
+                        n_clicks=0,
+                        disabled=True,
+                        style={"margin-left": "20px", "padding": "10px", "border": "1px solid gray", "border-radius": "10px", "width": "20%", "fontSize": "10px"},
+                    ),
                 ], style={"display": "flex", "flexDirection": "column", "justifyContent": "center", "margin": "35px", "gap":"10px"}),
+
+                # Background prediction job, polled until it finishes
+                dcc.Store(id="prediction-job"),
+                dcc.Interval(id="prediction-poll", interval=500, disabled=True),
                 
                 html.Div([
                     html.Label("Prediction:", style={"margin-left": "20px"}),
@@ -92,64 +119,162 @@ def get_main_page_layout():
         ]),
     ])
 
-def sentiment_analysis(user_input, team1):
-    """Predict the sentiment of the user input."""
-    if not user_input:
-        return "No input provided for analysis."
-    prediction = entity_sentiment_analysis(user_input, team1)
-    return prediction
+def start_sentiment_job(user_input, team1):
+    """Queue a sentiment prediction without waiting for it and return its job id."""
+    return prediction_jobs.track(inference_service.submit(user_input, team1))
+
+def filter_category(data, selected_category):
+    """Rows of the match table in one match category."""
+    return data[data["match_category"] == selected_category]
+
+@timed("figure")
+@cached_figures
+def create_category_charts(selected_category):
+    """Create the main page charts for one match category."""
+    return plot_category_charts(filter_category(get_matches(), selected_category))
+
+
+def add_live_matches(rows):
+    """Show new teams in the dropdowns and redraw only the categories that got matches."""
+    new_teams = set(rows["team_1"]) | set(rows["team_2"])
+    if not new_teams <= set(unique_teams):
+        unique_teams[:] = sorted(set(unique_teams) | new_teams)
+    for category in rows["match_category"].unique():
+        create_category_charts.invalidate(category)
+
+
+live_ingest.add_listener(head_to_head_index.append)
+live_ingest.add_listener(add_live_matches)
+
+@timed("figure")
+@slimmed
+def plot_category_charts(filtered_data):
+    """Plot team runs and the winners distribution for already filtered matches.
+
+    Both charts are drawn from totals per (winner, team) and per winner rather
+    than one element per match, so their size follows the number of teams.
+    """
+    team_runs = (
+        filtered_data.groupby(["winning_team", "team_1"], sort=False, observed=True)["team_1_runs"]
+        .sum()
+        .reset_index()
+    )
+    wins = filtered_data.groupby("winning_team", sort=False, observed=True).size().reset_index(name="matches")
+
+    fig1 = px.bar(
+        team_runs, 
+        x="team_1", 
+        y="team_1_runs", 
+        color="winning_team", 
+        title="Team Performance in Selected Match Category",
+        labels={"team_1": "Team", "team_1_runs": "Runs"}
+    )
+
+    fig2 = px.pie(
+        wins,
+        names="winning_team",
+        values="matches",
+        title="Winning Teams Distribution",
+    )
+
+    return fig1, fig2
 
 
 def register_main_page_callbacks(app):
     """Register callbacks for the Main Page."""
     
-    # Callback for Sentiment Prediction
+    # Callback for Sentiment Prediction, run in the background and polled
     @app.callback(
-        Output("prediction-output", "children"),
-        [Input("submit-button", "n_clicks")],
+        [Output("prediction-output", "children"),
+         Output("prediction-job", "data"),
+         Output("prediction-poll", "disabled"),
+         Output("cancel-button", "disabled")],
+        [Input("submit-button", "n_clicks"),
+         Input("prediction-poll", "n_intervals"),
+         Input("cancel-button", "n_clicks")],
         [State("team1-dropdown", "value"),
-         State("user-input", "value")]
+         State("user-input", "value"),
+         State("prediction-job", "data")]
     )
-    def update_prediction(submit_clicks, team1, user_input):
-        if submit_clicks > 0:
-            team1 = get_team_name(team1)
+    @timed("callback")
+    def update_prediction(submit_clicks, n_intervals, cancel_clicks, team1, user_input, job_id):
+        triggered = dash.callback_context.triggered_id
+
+        if triggered == "submit-button" and submit_clicks > 0:
+            if job_id:
+                prediction_jobs.cancel(job_id)
+            if not user_input:
+                return "No input provided for analysis.", None, True, True
+            # Live-appended teams may have codes the name map does not know
+            team1 = get_team_name(team1) or team1
             user_input = user_input + " from " + team1
-            return sentiment_analysis(user_input, team1)
-        return ""
+            job_id = start_sentiment_job(user_input, team1)
+            return f"Analyzing... (job {job_id[:8]})", job_id, False, False
+
+        if triggered == "cancel-button" and job_id:
+            prediction_jobs.cancel(job_id)
+            return "Prediction cancelled.", None, True, True
 
-    # Callback for Charts
+        if triggered == "prediction-poll" and job_id:
+            state, result = prediction_jobs.status(job_id)
+            if state == "pending":
+                return dash.no_update, job_id, False, False
+            if state == "done":
+                return result, None, True, True
+            if state == "failed":
+                return f"Prediction failed: {result}", None, True, True
+            if state == "unknown":
+                # Jobs live in one process's memory: a restart or another worker never saw this id
+                return "Prediction lost (server restarted or another worker); please resubmit.", None, True, True
+            return "Prediction cancelled.", None, True, True
+
+        return dash.no_update, dash.no_update, True, True
+
+    # Callback for the Team 1 vs Team 2 head-to-head summary
     @app.callback(
-        [Output("summary-chart-1", "figure"),
-         Output("summary-chart-2", "figure")],
-        [Input("League-Match", "n_clicks"),
-         Input("Semi-Final", "n_clicks"),
-         Input("Final", "n_clicks")]
+        Output("head-to-head-summary", "children"),
+        [Input("team1-dropdown", "value"),
+         Input("team2-dropdown", "value")]
     )
-    def update_charts(league_clicks, semi_final_clicks, final_clicks):
-        # Determine the selected category
-        ctx = dash.callback_context
-        if not ctx.triggered:
-            selected_category = "Final"
-        else:
-            selected_category = ctx.triggered[0]["prop_id"].split(".")[0]
-
-        # Filter the dataset
-        filtered_data = data[data["match_category"] == selected_category]
-
-        # Create charts
-        fig1 = px.bar(
-            filtered_data, 
-            x="team_1", 
-            y="team_1_runs", 
-            color="winning_team", 
-            title="Team Performance in Selected Match Category",
-            labels={"team_1": "Team", "team_1_runs": "Runs"}
-        )
+    @timed("callback")
+    def update_head_to_head(team1, team2):
+        return format_matchup(head_to_head_index.matchup(team1, team2), team1, team2)
 
-        fig2 = px.pie(
-            filtered_data,
-            names="winning_team",
-            title="Winning Teams Distribution",
+    # Callback for the Team 1 commentary sentiment, served from the offline index
+    @app.callback(
+        Output("team-sentiment-summary", "children"),
+        Input("team1-dropdown", "value")
+    )
+    @timed("callback")
+    def update_team_sentiment(team1):
+        return format_team_sentiment(team_sentiment_index, team1)
+
+    # Callback for Charts, filtered in the browser from the match-data store when enabled
+    if CLIENTSIDE_FILTERING:
+        app.clientside_callback(
+            ClientsideFunction(namespace="worldcup", function_name="update_charts"),
+            [Output("summary-chart-1", "figure"),
+             Output("summary-chart-2", "figure")],
+            [Input("League-Match", "n_clicks"),
+             Input("Semi-Final", "n_clicks"),
+             Input("Final", "n_clicks")],
+            State("match-data", "data")
+        )
+    else:
+        @app.callback(
+            [Output("summary-chart-1", "figure"),
+             Output("summary-chart-2", "figure")],
+            [Input("League-Match", "n_clicks"),
+             Input("Semi-Final", "n_clicks"),
+             Input("Final", "n_clicks")]
         )
+        @timed("callback")
+        def update_charts(league_clicks, semi_final_clicks, final_clicks):
+            # Determine the selected category
+            ctx = dash.callback_context
+            if not ctx.triggered:
+                selected_category = "Final"
+            else:
+                selected_category = ctx.triggered[0]["prop_id"].split(".")[0]
 
-        return fig1, fig2
\ No newline at end of file
+            return create_category_charts(selected_category)
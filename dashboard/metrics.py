@@ -0,0 +1,240 @@
+import bisect
+import functools
+import json
+import os
+import re
+import threading
+import time
+
+from flask import Response, abort, request
+
+# Latency histogram buckets in seconds, and payload buckets in bytes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Serve /metrics to other hosts too, not just loopback
+ALLOW_REMOTE = os.environ.get("METRICS_ALLOW_REMOTE") == "1"
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Latency and payload histograms plus gauges, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._errors = {}
+        self._payload = {}
+        self._figure_sizes = {}
+        self._collectors = []
+
+    def observe(self, name, kind, seconds):
+        """Record one call of `name`; kind is callback, figure, model or data."""
+        with self._lock:
+            histogram = self._latency.get((name, kind))
+            if histogram is None:
+                histogram = self._latency[(name, kind)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def error(self, name, kind):
+        with self._lock:
+            self._errors[(name, kind)] = self._errors.get((name, kind), 0) + 1
+
+    def observe_payload(self, name, size):
+        """Record the serialized size of a callback response."""
+        with self._lock:
+            histogram = self._payload.get(name)
+            if histogram is None:
+                histogram = self._payload[name] = Histogram(SIZE_BUCKETS)
+            histogram.observe(size)
+
+    def observe_figure_size(self, callback, output, size):
+        """Record the serialized size of one figure a callback sent to `output` (component.prop)."""
+        with self._lock:
+            histogram = self._figure_sizes.get((callback, output))
+            if histogram is None:
+                histogram = self._figure_sizes[(callback, output)] = Histogram(SIZE_BUCKETS)
+            histogram.observe(size)
+
+    def add_collector(self, collect):
+        """Register a function returning [(metric name, help, {labels}, value), ...] gauges."""
+        self._collectors.append(collect)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "latency": {key: (list(h.counts), h.total, h.count) for key, h in self._latency.items()},
+                "errors": dict(self._errors),
+                "payload": {key: (list(h.counts), h.total, h.count) for key, h in self._payload.items()},
+                "figures": {key: (list(h.counts), h.total, h.count) for key, h in self._figure_sizes.items()},
+            }
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        lines.append("# HELP dashboard_call_seconds Time spent in instrumented functions.")
+        lines.append("# TYPE dashboard_call_seconds histogram")
+        for (name, kind), histogram in sorted(snapshot["latency"].items()):
+            lines.extend(_histogram_lines("dashboard_call_seconds", {"name": name, "kind": kind}, LATENCY_BUCKETS, histogram))
+
+        lines.append("# HELP dashboard_call_errors_total Instrumented calls that raised.")
+        lines.append("# TYPE dashboard_call_errors_total counter")
+        for (name, kind), count in sorted(snapshot["errors"].items()):
+            lines.append(f"dashboard_call_errors_total{_labels({'name': name, 'kind': kind})} {count}")
+
+        lines.append("# HELP dashboard_response_bytes Serialized size of Dash callback responses.")
+        lines.append("# TYPE dashboard_response_bytes histogram")
+        for name, histogram in sorted(snapshot["payload"].items()):
+            lines.extend(_histogram_lines("dashboard_response_bytes", {"callback": name}, SIZE_BUCKETS, histogram))
+
+        lines.append("# HELP dashboard_figure_bytes Serialized size of the figures in Dash callback responses, per output.")
+        lines.append("# TYPE dashboard_figure_bytes histogram")
+        for (name, output), histogram in sorted(snapshot["figures"].items()):
+            lines.extend(_histogram_lines("dashboard_figure_bytes", {"callback": name, "output": output}, SIZE_BUCKETS, histogram))
+
+        gauges = {}
+        for collect in self._collectors:
+            for metric, help_text, labels, value in collect():
+                gauges.setdefault((metric, help_text), []).append((labels, value))
+        for (metric, help_text), samples in sorted(gauges.items()):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, value in samples:
+                lines.append(f"{metric}{_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _histogram_lines(metric, labels, buckets, histogram):
+    counts, total, count = histogram
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+        cumulative += bucket_count
+        lines.append(f"{metric}_bucket{_labels(dict(labels, le=bound))} {cumulative}")
+    lines.append(f"{metric}_sum{_labels(labels)} {total}")
+    lines.append(f"{metric}_count{_labels(labels)} {count}")
+    return lines
+
+
+# Shared registry for the dashboard process
+metrics = MetricsRegistry()
+
+
+def timed(kind, name=None):
+    """Decorator recording the latency of every call under the given kind."""
+    def decorate(func):
+        metric_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                metrics.error(metric_name, kind)
+                raise
+            finally:
+                metrics.observe(metric_name, kind, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+def _value_sizes(text, index, path, depth, sizes):
+    """Collect (key path, bytes) for the values `depth` objects deep in the JSON at text[index].
+
+    Sizes are spans of the text itself, so nothing is re-encoded. Returns the index
+    just past the value.
+    """
+    if depth == 0 or text[index] != "{":
+        _, end = _decoder.raw_decode(text, index)
+        if depth == 0:
+            sizes.append((path, end - index))
+        return end
+    index = _whitespace.match(text, index + 1).end()
+    while text[index] != "}":
+        key, index = _decoder.raw_decode(text, index)
+        # Past the colon to the value
+        index = _whitespace.match(text, _whitespace.match(text, index).end() + 1).end()
+        index = _value_sizes(text, index, path + (key,), depth - 1, sizes)
+        index = _whitespace.match(text, index).end()
+        if text[index] == ",":
+            index = _whitespace.match(text, index + 1).end()
+    return index + 1
+
+
+def figure_sizes(body):
+    """(output, bytes) of each figure in a Dash callback response body.
+
+    The body is {"multi": true, "response": {component id: {prop: value}}}; anything
+    else has no figures. Raises ValueError or IndexError on malformed JSON.
+    """
+    sizes = []
+    start = _whitespace.match(body).end()
+    if body[start:start + 1] != "{":
+        return []
+    _value_sizes(body, start, (), 3, sizes)
+    return [
+        (f"{component}.{prop}", size)
+        for (key, component, prop), size in sizes
+        if key == "response" and prop == "figure"
+    ]
+
+
+def register_metrics_endpoint(app, path="/metrics"):
+    """Expose the registry on the Dash app's Flask server and track callback response and figure sizes."""
+    server = app.server
+
+    @server.after_request
+    def record_callback_payload(response):
+        if request.path.endswith("/_dash-update-component") and response.status_code == 200:
+            output = (request.get_json(silent=True) or {}).get("output", "")
+            callback = app.callback_map.get(output, {}).get("callback")
+            name = getattr(callback, "__name__", None) or output
+            metrics.observe_payload(name, response.calculate_content_length() or 0)
+            # Only plain buffered JSON can be measured in place; a metric must never fail the callback
+            if response.direct_passthrough or response.is_streamed or response.content_encoding:
+                return response
+            try:
+                sizes = figure_sizes(response.get_data(as_text=True))
+            except Exception:
+                metrics.error("figure_sizes", "metrics")
+                sizes = []
+            for figure, size in sizes:
+                metrics.observe_figure_size(name, figure, size)
+        return response
+
+    @server.route(path)
+    def prometheus_metrics():
+        if not ALLOW_REMOTE and request.remote_addr not in ("127.0.0.1", "::1"):
+            abort(403)
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from inference_backends import BACKEND, load_model
+from metrics import metrics
+
+# Serialized transformers pipelines produced by model_impl.ipynb
+MODEL_PATHS = {
+    "sentiment": "../models/sentiment_model.joblib",
+    "ner": "../models/ner_model.joblib",
+}
+
+
+class ModelRegistry:
+    """Lazily load each model pipeline once and keep it resident for the process."""
+
+    def __init__(self, paths=None, backend=BACKEND):
+        self._paths = dict(MODEL_PATHS if paths is None else paths)
+        self.backend = backend
+        self._models = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Return the named model, loading it on first use."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        # Double-checked so concurrent Dash threads deserialize a model only once
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def _load(self, name):
+        if name not in self._paths:
+            raise KeyError(f"Unknown model: {name}")
+
+        import psutil
+
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+
+        model = load_model(self._paths[name], self.backend)
+
+        self._stats[name] = {
+            "path": self._paths[name],
+            "backend": self.backend,
+            "load_seconds": time.perf_counter() - start,
+            "resident_bytes": max(process.memory_info().rss - rss_before, 0),
+        }
+        return model
+
+    def warm_up(self, names=None):
+        """Load the given models (all by default) ahead of the first request."""
+        for name in names or self._paths:
+            self.get(name)
+        return self.stats()
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def stats(self):
+        """Return load time and resident size for every model loaded so far."""
+        return {name: dict(stat) for name, stat in self._stats.items()}
+
+
+# Shared registry for the whole dashboard process
+registry = ModelRegistry()
+
+
+def _collect_gauges():
+    gauges = []
+    for name, stat in registry.stats().items():
+        labels = {"model": name, "backend": stat["backend"]}
+        gauges.append(("dashboard_model_load_seconds", "Time taken to load a model.", labels, stat["load_seconds"]))
+        gauges.append(("dashboard_model_resident_bytes", "Memory growth from loading a model.", labels, stat["resident_bytes"]))
+    return gauges
+
+
+metrics.add_collector(_collect_gauges)
+
+
+def format_stats(stats):
+    """Render registry stats as a short human readable report."""
+    lines = []
+    for name, stat in stats.items():
+        lines.append(
+            f"{name} ({stat['backend']}): loaded in {stat['load_seconds']:.2f}s, "
+            f"~{stat['resident_bytes'] / (1024 * 1024):.0f} MiB resident"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from precomputed import Precomputed
+
+# Flattened per-match columns and the metric each one feeds
+PLAYER_COLUMNS = [
+    ("best_batter_1", "best_batter_1_runs", "runs"),
+    ("best_batter_2", "best_batter_2_runs", "runs"),
+    ("best_baller_1", "best_baller_1_wick", "wickets"),
+    ("best_baller_2", "best_baller_2_wick", "wickets"),
+    ("pom", None, "player_of_match"),
+]
+METRICS = ["runs", "wickets", "player_of_match"]
+METRIC_LABELS = {"runs": "Runs", "wickets": "Wickets", "player_of_match": "Player of the Match awards"}
+TOP_K = 10
+# Team boards for players whose side the data cannot pin down: "skip" leaves them
+# off, "both" credits them to every side they could have played for
+AMBIGUOUS_TEAMS = os.environ.get("LEADERBOARD_AMBIGUOUS_TEAMS", "skip")
+
+
+def player_table(data):
+    """Unpivot the best performer columns into one row per (match, player, metric).
+
+    Player names are interned as integer ids; returns the table and the name array.
+    """
+    frames = []
+    for name_column, value_column, metric in PLAYER_COLUMNS:
+        values = data[value_column].to_numpy() if value_column else np.ones(len(data), dtype="int64")
+        frames.append(pd.DataFrame({
+            "match": np.arange(len(data)),
+            "name": data[name_column].astype(str).to_numpy(),
+            "metric": metric,
+            "value": values,
+        }))
+    table = pd.concat(frames, ignore_index=True)
+    table = table[(table["name"] != "Unknown") & (table["value"] > 0)]
+
+    codes, names = pd.factorize(table["name"], sort=True)
+    table = pd.DataFrame({
+        "player": codes.astype("int32"),
+        "match": table["match"].to_numpy(dtype="int32"),
+        "world_cup_year": data["world_cup_year"].to_numpy()[table["match"].to_numpy()],
+        "metric": pd.Categorical(table["metric"], categories=METRICS),
+        "value": table["value"].to_numpy(dtype="int64"),
+    })
+    return table, np.asarray(names)
+
+
+def team_candidates(table, data):
+    """(player, team) pairs where the team played in every match the player appears in.
+
+    The source only names the players, so a player's team is one of these sides.
+    A player with one candidate has a known team; one who only ever appears in
+    a single match, or always against the same opponent, has two.
+    """
+    matches = table[["player", "match"]].drop_duplicates()
+    sides = pd.concat([
+        pd.DataFrame({"player": matches["player"].to_numpy(), "team": data["team_1"].astype(str).to_numpy()[matches["match"]]}),
+        pd.DataFrame({"player": matches["player"].to_numpy(), "team": data["team_2"].astype(str).to_numpy()[matches["match"]]}),
+    ])
+    appearances = matches.groupby("player").size()
+    counts = sides.groupby(["player", "team"]).size().reset_index(name="count")
+    counts = counts[counts["count"].to_numpy() == appearances.reindex(counts["player"]).to_numpy()]
+    return counts[["player", "team"]].reset_index(drop=True)
+
+
+def player_teams(table, data):
+    """Team of each player, or None when their matches do not pin it down (see team_candidates)."""
+    counts = team_candidates(table, data)
+    unique = counts[counts["player"].map(counts["player"].value_counts()) == 1]
+    teams = np.full(table["player"].max() + 1 if len(table) else 0, None, dtype=object)
+    teams[unique["player"].to_numpy()] = unique["team"].to_numpy()
+    return teams
+
+
+class PlayerLeaderboards(Precomputed):
+    """Top-K players per (year, team, metric), where year and team may be None for "all".
+
+    ``ambiguous_teams`` decides the team boards for players whose team the data
+    cannot tell: "skip" leaves them off, "both" lists them on every candidate
+    side (see team_candidates). The year and overall boards include them either way.
+    """
+
+    def __init__(self, data, top_k=TOP_K, lazy=False, ambiguous_teams=AMBIGUOUS_TEAMS):
+        if ambiguous_teams not in ("skip", "both"):
+            raise ValueError(f"ambiguous_teams must be 'skip' or 'both', not {ambiguous_teams!r}")
+        self.top_k = top_k
+        self.ambiguous_teams = ambiguous_teams
+        super().__init__(data, lazy=lazy)
+
+    def _build(self, data):
+        table, names = player_table(data)
+        teams = player_teams(table, data)
+        table["team"] = teams[table["player"].to_numpy()] if len(table) else []
+        if self.ambiguous_teams == "both":
+            team_table = table.drop(columns="team").merge(team_candidates(table, data), on="player")
+        else:
+            team_table = table
+
+        boards = {}
+        groupings = [
+            ["world_cup_year", "team", "metric"],
+            ["world_cup_year", "metric"],
+            ["team", "metric"],
+            ["metric"],
+        ]
+        for keys in groupings:
+            source = team_table if "team" in keys else table
+            totals = source.groupby(keys + ["player"], observed=True, dropna=True)["value"].sum().reset_index()
+            for group_key, group in totals.groupby(keys, observed=True, sort=False):
+                group_key = dict(zip(keys, group_key if isinstance(group_key, tuple) else (group_key,)))
+                # Highest value first, ties broken by name
+                order = np.lexsort((names[group["player"].to_numpy()], -group["value"].to_numpy()))[: self.top_k]
+                board_key = (group_key.get("world_cup_year"), group_key.get("team"), group_key["metric"])
+                boards[board_key] = (
+                    group["player"].to_numpy()[order],
+                    group["value"].to_numpy()[order],
+                )
+
+        self.table = table
+        self.names = names
+        self.teams = teams
+        self._boards = boards
+
+    def leaderboard(self, metric, year=None, team=None):
+        """Return [(player name, value), ...] for the given metric, best first."""
+        self.ensure_built()
+        board = self._boards.get((year, team, metric))
+        if board is None:
+            return []
+        players, values = board
+        return list(zip(self.names[players].tolist(), values.tolist()))
@@ -0,0 +1,64 @@
+import threading
+import time
+
+from dataset import concat_matches
+from metrics import metrics
+
+
+class Precomputed:
+    """Base for structures derived from the match table.
+
+    Subclasses implement ``_build(data)`` and call ``ensure_built()`` before
+    reading their state. With ``lazy=True`` the build is deferred to first use,
+    so importing a page does not pay for it.
+
+    Live-appended matches arrive through ``append(rows)``. Subclasses that set
+    ``incremental = True`` fold them in with ``_append(rows)``; the others are
+    rebuilt from the full table the next time they are read.
+    """
+
+    incremental = False
+
+    def __init__(self, data, lazy=False):
+        self._lock = threading.RLock()
+        self._data = data
+        self._pending = []
+        self._built = False
+        if not lazy:
+            self.rebuild(data)
+
+    def rebuild(self, data):
+        """Recompute everything from the given match table."""
+        with self._lock:
+            start = time.perf_counter()
+            self._data = data
+            self._pending = []
+            self._build(data)
+            self._built = True
+            metrics.observe(f"{type(self).__name__}.build", "data", time.perf_counter() - start)
+
+    def ensure_built(self):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    if self._pending:
+                        self._data = concat_matches([self._data] + self._pending)
+                    self.rebuild(self._data)
+
+    def append(self, rows):
+        """Account for matches appended to the table, given with their table positions as index."""
+        with self._lock:
+            if self._built and self.incremental:
+                start = time.perf_counter()
+                self._append(rows)
+                metrics.observe(f"{type(self).__name__}.append", "data", time.perf_counter() - start)
+            else:
+                # Kept only until the next build folds them into the table
+                self._pending.append(rows)
+                self._built = False
+
+    def _build(self, data):
+        raise NotImplementedError
+
+    def _append(self, rows):
+        raise NotImplementedError
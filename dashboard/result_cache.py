@@ -0,0 +1,68 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Size and lifetime of the prediction cache, overridable from the environment
+CACHE_SIZE = int(os.environ.get("SENTIMENT_CACHE_SIZE", "4096"))
+CACHE_TTL = float(os.environ.get("SENTIMENT_CACHE_TTL", "3600"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Collapse runs of whitespace so trivially different inputs share a cache entry."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a fixed time."""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Predictions keyed by (normalized text, target entity)
+prediction_cache = TTLCache()
@@ -0,0 +1,125 @@
+import argparse
+import csv
+import json
+import os
+import time
+
+import pandas as pd
+
+from dataset import file_digest
+from model_registry import registry
+
+INPUT_PATH = "../data/commentary_2023.csv"
+OUTPUT_PATH = "../data/commentary_scored.csv"
+
+OUTPUT_COLUMNS = ["line_id", "commentary", "label", "score"]
+
+
+def _checkpoint_path(output):
+    return output + ".checkpoint.json"
+
+
+def _load_checkpoint(output, input_digest):
+    """Rows already scored for this input, or None to start over."""
+    try:
+        with open(_checkpoint_path(output), encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("input_digest") != input_digest or not os.path.exists(output):
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(output, checkpoint):
+    path = _checkpoint_path(output)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def score_texts(sentiment_model, texts, batch_size, max_length):
+    """Run the sentiment pipeline over a list of texts, returning (labels, scores)."""
+    outputs = sentiment_model(texts, batch_size=batch_size, truncation=True, max_length=max_length)
+    return [output["label"] for output in outputs], [float(output["score"]) for output in outputs]
+
+
+def score_file(input_path=INPUT_PATH, output=OUTPUT_PATH, chunk_size=256, batch_size=16,
+               max_length=512, threads=None, restart=False):
+    """Score every commentary line in chunks, resuming from the last checkpoint."""
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+    input_digest = file_digest(input_path)
+    checkpoint = None if restart else _load_checkpoint(output, input_digest)
+
+    if checkpoint is None:
+        checkpoint = {"input_digest": input_digest, "rows_done": 0, "output_bytes": 0}
+        with open(output, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(OUTPUT_COLUMNS)
+        checkpoint["output_bytes"] = os.path.getsize(output)
+        _save_checkpoint(output, checkpoint)
+    else:
+        # Drop anything written after the last checkpoint, e.g. by a crash mid-chunk
+        with open(output, "r+b") as f:
+            f.truncate(checkpoint["output_bytes"])
+
+    sentiment_model = registry.get("sentiment")
+    resumed_from = checkpoint["rows_done"]
+    scored = 0
+    start = time.perf_counter()
+
+    # Quoted commentary can span lines, so skip finished rows by record rather than by line
+    position = 0
+    for chunk in pd.read_csv(input_path, index_col=0, chunksize=chunk_size):
+        position += len(chunk)
+        if position <= resumed_from:
+            continue
+        chunk = chunk.iloc[max(0, len(chunk) - (position - resumed_from)):]
+
+        texts = chunk["commentary"].fillna("").astype(str).tolist()
+        labels, scores = score_texts(sentiment_model, texts, batch_size, max_length)
+
+        scored_chunk = pd.DataFrame({
+            "line_id": chunk.index,
+            "commentary": chunk["commentary"].to_numpy(),
+            "label": labels,
+            "score": scores,
+        })
+        scored_chunk.to_csv(output, mode="a", header=False, index=False)
+
+        scored += len(chunk)
+        checkpoint["rows_done"] = resumed_from + scored
+        checkpoint["output_bytes"] = os.path.getsize(output)
+        _save_checkpoint(output, checkpoint)
+
+    seconds = time.perf_counter() - start
+    return {
+        "resumed_from": resumed_from,
+        "scored": scored,
+        "total": checkpoint["rows_done"],
+        "seconds": seconds,
+        "rows_per_second": scored / seconds if seconds else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score commentary lines with the sentiment model in batches.")
+    parser.add_argument("--input", default=INPUT_PATH)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--chunk-size", type=int, default=256, help="rows read and checkpointed at a time")
+    parser.add_argument("--batch-size", type=int, default=16, help="texts per forward pass")
+    parser.add_argument("--max-length", type=int, default=512, help="truncate inputs to this many tokens")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start over")
+    args = parser.parse_args()
+
+    summary = score_file(
+        args.input, args.output, args.chunk_size, args.batch_size, args.max_length, args.threads, args.restart
+    )
+    print(
+        f"scored {summary['scored']} rows (resumed from {summary['resumed_from']}, {summary['total']} total) "
+        f"in {summary['seconds']:.1f} s, {summary['rows_per_second']:.1f} rows/s -> {args.output}"
+    )
@@ -1,23 +1,9 @@
-from joblib import load
-
-
-
-def entity_sentiment_analysis(text, target_entity):
-    
-    sentiment_model = load("../models/sentiment_model.joblib")
-    ner_model = load("../models/ner_model.joblib")
-    
-    # Extract entities
-    entities = ner_model(text)
-    entity_names = [e['word'] for e in entities]
-    
+def describe_sentiment(text, target_entity, entity_names, sentiment):
+    """Turn NER output and a sentiment label into the message shown to the user."""
     # Check if the target entity is in the text
     if target_entity not in entity_names:
         return f"No sentiment detected for {target_entity}"
     
-    # Get sentiment
-    sentiment = sentiment_model(text)[0]['label']
-    
     # Interpret sentiment relative to the entity
     if target_entity in text:
         if sentiment == "POSITIVE":
@@ -25,4 +11,4 @@ def entity_sentiment_analysis(text, target_entity):
         elif sentiment == "NEGATIVE":
             return f"Negative sentiment for {target_entity}"
     
-    return f"Neutral sentiment for {target_entity}"
\ No newline at end of file
+    return f"Neutral sentiment for {target_entity}"
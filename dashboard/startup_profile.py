@@ -0,0 +1,109 @@
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("STARTUP_PROFILE") == "1"
+
+_imports = {}
+_stages = []
+_stack = []
+_local = threading.local()
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wrap a module's loader to time its execution, excluding nested imports."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        name = module.__name__
+        # Put the real loader back so the module never sees the wrapper
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+
+        _stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            nested = _stack.pop()
+            if _stack:
+                _stack[-1] += total
+            _imports[name] = (total - nested, total)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if getattr(_local, "searching", False):
+            return None
+        _local.searching = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader)
+                    return spec
+            return None
+        finally:
+            _local.searching = False
+
+
+def install():
+    """Start timing every module imported from now on."""
+    if not any(isinstance(finder, _TimingFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _TimingFinder())
+
+
+@contextmanager
+def stage(name):
+    """Time a named block of startup work such as loading data."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stages.append((name, time.perf_counter() - start))
+
+
+def report(top=25, process_start=None):
+    """Startup breakdown: slowest modules by own import time, then named stages."""
+    lines = []
+    if process_start is not None:
+        lines.append(f"startup took {time.perf_counter() - process_start:.3f} s")
+
+    lines.append(f"{'self ms':>9} {'total ms':>9}  module")
+    ranked = sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    for name, (own, total) in ranked:
+        lines.append(f"{own * 1000:9.1f} {total * 1000:9.1f}  {name}")
+
+    # Totals per top-level package give the cost of each dependency
+    packages = {}
+    for name, (own, _) in _imports.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + own
+    lines.append("")
+    lines.append(f"{'ms':>9}  package")
+    for package, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"{own * 1000:9.1f}  {package}")
+
+    if _stages:
+        lines.append("")
+        lines.append(f"{'ms':>9}  stage")
+        for name, seconds in _stages:
+            lines.append(f"{seconds * 1000:9.1f}  {name}")
+
+    heavy = [package for package in ("torch", "transformers", "datasets") if package in sys.modules]
+    lines.append("")
+    lines.append(f"heavy ML packages imported at startup: {', '.join(heavy) if heavy else 'none'}")
+    return "\n".join(lines)
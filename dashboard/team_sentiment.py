@@ -0,0 +1,178 @@
+import argparse
+import ast
+import json
+import os
+import time
+
+import pandas as pd
+
+from dataset import file_digest
+from map_team import get_team_name
+from precomputed import Precomputed
+
+# Scored commentary: score_commentary.py output when present, else the notebook's file
+SCORED_PATH = "../data/commentary_scored.csv"
+LEGACY_SCORED_PATH = "../data/commentary_with_sentiment.csv"
+INDEX_PATH = "../data/team_sentiment_index.json"
+
+# Names commentary uses for teams whose dashboard name is a short code
+TEAM_ALIASES = {
+    "EAF": ["East Africa"],
+    "NZ": ["New Zealand"],
+    "SA": ["South Africa"],
+    "SL": ["Sri Lanka"],
+    "UAE": ["United Arab Emirates"],
+    "WI": ["West Indies"],
+}
+
+
+def read_scored(path):
+    """Scored commentary as line_id, commentary, label and score columns.
+
+    Accepts the typed output of score_commentary.py, or the older file whose
+    sentiment column holds a repr'd list that has to be parsed once here.
+    """
+    scored = pd.read_csv(path)
+    if "label" in scored:
+        return scored[["line_id", "commentary", "label", "score"]]
+
+    sentiment = scored["sentiment"].map(lambda value: ast.literal_eval(value)[0])
+    return pd.DataFrame({
+        "line_id": scored.iloc[:, 0],
+        "commentary": scored["commentary"],
+        "label": sentiment.map(lambda result: result["label"]),
+        "score": sentiment.map(lambda result: float(result["score"])),
+    })
+
+
+def build_index(source=None, output=INDEX_PATH, batch_size=16):
+    """Run NER once over every scored line and write the entity -> lines index."""
+    from model_registry import registry
+
+    if source is None:
+        source = SCORED_PATH if os.path.exists(SCORED_PATH) else LEGACY_SCORED_PATH
+    scored = read_scored(source)
+    texts = scored["commentary"].fillna("").astype(str).tolist()
+
+    ner_model = registry.get("ner")
+    start = time.perf_counter()
+    # Merge wordpieces into whole spans so multi-word names such as "New Zealand" are keys
+    entity_batches = ner_model(texts, batch_size=batch_size, aggregation_strategy="simple")
+    seconds = time.perf_counter() - start
+
+    entities = {}
+    for line_id, label, score, found in zip(scored["line_id"], scored["label"], scored["score"], entity_batches):
+        # A line counts once per entity however often it is mentioned
+        seen = set()
+        for entity in found:
+            word = entity["word"].strip()
+            if not word or word in seen:
+                continue
+            seen.add(word)
+            record = entities.setdefault(word, {
+                "type": entity.get("entity_group", entity.get("entity")),
+                "lines": [],
+            })
+            record["lines"].append([int(line_id), label, round(float(score), 6)])
+
+    index = {
+        "source": os.path.basename(source),
+        "source_digest": file_digest(source),
+        "lines": len(scored),
+        "entities": entities,
+    }
+    tmp_path = output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, output)
+    return {"source": source, "lines": len(scored), "entities": len(entities), "seconds": seconds}
+
+
+def _summarize(lines):
+    positive = sum(label == "POSITIVE" for _, label, _ in lines)
+    return {
+        "lines": len(lines),
+        "positive": positive,
+        "negative": len(lines) - positive,
+        "mean_score": sum(score for _, _, score in lines) / len(lines) if lines else 0.0,
+    }
+
+
+def _modified(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class TeamSentimentIndex(Precomputed):
+    """Commentary sentiment per team and player, read from the offline index file.
+
+    The file is read again whenever its modification time changes, so building
+    the index while the dashboard runs takes effect without a restart.
+    """
+
+    def ensure_built(self):
+        if self._built and self._modified != _modified(self._data):
+            self.rebuild(self._data)
+        super().ensure_built()
+
+    def _build(self, path):
+        # Taken before reading, so a write during the read is picked up next time
+        self._modified = _modified(path)
+        try:
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            # Missing, truncated or corrupt index files all read as not built yet
+            index = None
+
+        self.available = index is not None
+        self._entities = index["entities"] if index else {}
+        self._teams = {}
+
+    def entity(self, name):
+        """Index entry (type and [line_id, label, score] postings) for an NER entity, or None."""
+        self.ensure_built()
+        return self._entities.get(name)
+
+    def team(self, team):
+        """Sentiment counts over every commentary line naming a team code or one of its aliases."""
+        self.ensure_built()
+        summary = self._teams.get(team)
+        if summary is None:
+            lines = {}
+            for name in [team, get_team_name(team)] + TEAM_ALIASES.get(team, []):
+                for line in self._entities.get(name, {}).get("lines", []):
+                    lines[line[0]] = line
+            summary = self._teams[team] = _summarize(list(lines.values()))
+        return summary
+
+
+def format_team_sentiment(index, team):
+    """One-line commentary sentiment summary for a team."""
+    summary = index.team(team)
+    if not index.available:
+        return "Commentary sentiment index not built yet."
+    name = TEAM_ALIASES.get(team, [get_team_name(team) or team])[0]
+    if not summary["lines"]:
+        return f"No scored commentary mentions {name}."
+    return (
+        f"Commentary on {name}: {summary['lines']} line{'s' if summary['lines'] != 1 else ''}, "
+        f"{summary['positive']} positive and {summary['negative']} negative "
+        f"(mean confidence {summary['mean_score']:.2f})."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index scored commentary by the teams and players it names.")
+    parser.add_argument("--source", default=None, help=f"scored commentary (default: {SCORED_PATH} if present, else {LEGACY_SCORED_PATH})")
+    parser.add_argument("--output", default=INDEX_PATH)
+    parser.add_argument("--batch-size", type=int, default=16, help="texts per NER forward pass")
+    args = parser.parse_args()
+
+    summary = build_index(args.source, args.output, args.batch_size)
+    print(
+        f"indexed {summary['lines']} lines from {summary['source']}: {summary['entities']} entities, "
+        f"NER in {summary['seconds']:.1f} s -> {args.output}"
+    )